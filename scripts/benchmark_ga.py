@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# scripts/benchmark_ga.py
+"""
+Benchmark GA variants: evaluations needed to reach a target lap time,
+final best lap time and throughput (evaluations/sec), over several seeds.
+"""
+
+import sys
+import os
+import argparse
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from genetic_optimizer import GeneticOptimizer
+from track_loader import load_waypoints, build_spline
+
+# name -> GAConfig overrides
+VARIANTS = {
+    "fixed":          {},
+    "no_elitism":     {"elite_size": 0, "stagnation_generations": 0},
+    "one_fifth":      {"adaptation": "one_fifth"},
+    "self_adaptive":  {"adaptation": "self_adaptive"},
+    "one_fifth+div":  {"adaptation": "one_fifth", "diversity_control": True},
+    "steady_state":   {"mode": "steady_state"},
+}
+
+def evaluations_to_target(history, target):
+    """Evaluations spent when the best lap time first reached target (None if never)."""
+    best = np.minimum.accumulate([h['best'] for h in history])
+    hits = np.flatnonzero(best <= target)
+    return history[hits[0]]['evaluations'] if len(hits) else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GA variants over several seeds")
+    parser.add_argument("--track", "-t", default="tracks/waypoints_S.csv")
+    parser.add_argument("--config", "-c", default="config/genetic_algorithm.yaml")
+    parser.add_argument("--points", "-p", type=int, default=500)
+    parser.add_argument("--seeds", type=int, default=5, help="Runs per variant")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed (runs use run_index 0..N-1)")
+    parser.add_argument("--generations", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--target", type=float, default=None,
+                       help="Target lap time in s (default: centerline - 0.07s)")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS),
+                       choices=list(VARIANTS))
+    args = parser.parse_args()
+
+    x, y = load_waypoints(args.track)
+    x_s, y_s = build_spline(x, y, num_points=args.points)
+
+    print(f"{'variant':<16}{'evals→target (median)':>24}{'reached':>10}"
+          f"{'best lap (mean)':>18}{'evals/s':>10}")
+    print("-" * 78)
+    for name in args.variants:
+        evals, bests, rates = [], [], []
+        for run in range(args.seeds):
+            optimizer = GeneticOptimizer(args.config, seed=args.seed, run_index=run)
+            cfg = optimizer.config
+            cfg.show_progress = cfg.show_statistics = cfg.show_hall_of_fame = False
+            if args.generations is not None:
+                cfg.generations = args.generations
+            if args.workers is not None:
+                cfg.workers = args.workers
+            for key, value in VARIANTS[name].items():
+                setattr(cfg, key, value)
+
+            results = optimizer.FindBestLap(x_s, y_s)
+            target = args.target if args.target is not None else optimizer.baseline - 0.07
+            evals.append(evaluations_to_target(optimizer.history, target))
+            bests.append(results[0].lap_time)
+            rates.append(optimizer.evals_per_sec)
+
+        reached = [e for e in evals if e is not None]
+        median = f"{np.median(reached):.0f}" if reached else "-"
+        print(f"{name:<16}{median:>24}{len(reached):>6}/{args.seeds:<3}"
+              f"{np.mean(bests):>18.3f}{np.mean(rates):>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# scripts/check_telemetry.py
+"""
+Check the telemetry comparator on synthetic noisy laps: a rider a fixed
+fraction slower than the reference, several laps starting mid-lap, with
+Gaussian GPS noise. The expected delta is known exactly, so any lap
+miscount (jitter across the start/finish node) shows up as a ~lap-time error.
+"""
+
+import sys
+import os
+import argparse
+
+import numpy as np
+
+# Add src to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from track_loader import load_waypoints, build_spline
+from dynamics import compute_lap_profile
+from telemetry import TelemetryComparator, compare_lap
+
+def synthetic_lap(x_s, y_s, profile, slowdown, laps, start, rate, noise, rng):
+    """Noisy GPS samples of a rider `slowdown` slower than the reference lap."""
+    period = profile.lap_time / (1 - slowdown)
+    t_nodes = np.append(profile.t_cum, profile.lap_time) / (1 - slowdown)
+    x_nodes, y_nodes = np.append(x_s, x_s[0]), np.append(y_s, y_s[0])
+    t = start * period + np.arange(0, laps * period, 1 / rate)
+    phase = t % period
+    x = np.interp(phase, t_nodes, x_nodes) + rng.normal(0, noise, len(t))
+    y = np.interp(phase, t_nodes, y_nodes) + rng.normal(0, noise, len(t))
+    return t, x, y
+
+def main():
+    parser = argparse.ArgumentParser(description="Check telemetry deltas on synthetic noisy laps")
+    parser.add_argument("--track", "-t", default="tracks/waypoints_S.csv")
+    parser.add_argument("--points", "-p", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=100, help="GPS rate in Hz")
+    parser.add_argument("--laps", type=float, default=2.5)
+    parser.add_argument("--start", type=float, default=0.4, help="Start position as a lap fraction")
+    parser.add_argument("--slowdown", type=float, default=0.05)
+    parser.add_argument("--noise", type=float, nargs="+", default=[0.3, 0.5, 1.0], help="GPS noise (m)")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Max allowed delta error (s)")
+    args = parser.parse_args()
+
+    x_s, y_s = build_spline(*load_waypoints(args.track), num_points=args.points)
+    profile = compute_lap_profile(x_s, y_s)
+    comparator = TelemetryComparator.from_profile(x_s, y_s, profile)
+
+    print(f"{'noise (m)':<12}{'failed seeds':>14}{'max |Δ error| (s)':>20}")
+    print("-" * 46)
+    ok = True
+    for noise in args.noise:
+        errors = []
+        for seed in range(args.seeds):
+            t, x, y = synthetic_lap(x_s, y_s, profile, args.slowdown, args.laps,
+                                    args.start, args.rate, noise,
+                                    np.random.default_rng(seed))
+            expected = (t - t[0]) * args.slowdown
+            errors.append(np.max(np.abs(compare_lap(comparator, t, x, y)["delta"] - expected)))
+        failed = sum(e > args.tolerance for e in errors)
+        ok &= failed == 0
+        print(f"{noise:<12.2f}{failed:>8}/{args.seeds:<5}{max(errors):>20.3f}")
+
+    print("✅ Telemetry deltas within tolerance" if ok else "❌ Telemetry deltas out of tolerance")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
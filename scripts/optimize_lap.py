@@ -7,12 +7,18 @@ Example script showing how to use the Genetic Algorithm optimizer
 import sys
 import os
 import argparse
+from contextlib import nullcontext
+from dataclasses import asdict
 
 # Add src to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from genetic_optimizer import FindBestLap, GeneticOptimizer
-from track_loader import load_waypoints, build_spline
+from genetic_optimizer import GeneticOptimizer
+from track_loader import load_waypoints, build_spline, track_hash
+from dynamics import VEHICLE_DEFAULTS
+from result_store import ResultStore, fitness_key
+from dp_line import dp_racing_line, DP_OBJECTIVES
+from step3_evaluation import evaluate
 from logger_setup import setup_logger
 
 def main():
@@ -25,6 +31,26 @@ def main():
                        help="Number of spline points to generate")
     parser.add_argument("--quiet", "-q", action="store_true",
                        help="Disable logging")
+    parser.add_argument("--seed", type=int, default=None,
+                       help="Random seed (overrides evolution.seed) for reproducible runs")
+    parser.add_argument("--run-index", type=int, default=None,
+                       help="Independent random stream for batched runs sharing a seed")
+    parser.add_argument("--open", action="store_true",
+                       help="Open (point-to-point) track instead of a closed loop")
+    parser.add_argument("--entry-speed", type=float, default=None,
+                       help="Entry speed in m/s for open tracks")
+    parser.add_argument("--exit-speed", type=float, default=None,
+                       help="Exit speed in m/s for open tracks")
+    parser.add_argument("--store", default="outputs/results.sqlite",
+                       help="SQLite result store (hall of fame, stats, metadata)")
+    parser.add_argument("--no-store", action="store_true",
+                       help="Do not read from or write to the result store")
+    parser.add_argument("--warm-start", type=int, default=10,
+                       help="Seed up to N genomes from stored runs on the same/similar track (0 = off)")
+    parser.add_argument("--dp-seed", action="store_true",
+                       help="Seed the population with the dynamic-programming racing line")
+    parser.add_argument("--dp-objective", choices=DP_OBJECTIVES, default="time",
+                       help="Objective of the DP racing line used by --dp-seed")
     
     args = parser.parse_args()
     
@@ -34,40 +60,95 @@ def main():
         logger.info("Starting lap time optimization")
     
     try:
-        # Load track data
-        print(f"📍 Loading track: {args.track}")
-        x, y = load_waypoints(args.track)
-        x_s, y_s = build_spline(x, y, num_points=args.points)
-        print(f"   Original waypoints: {len(x)}")
-        print(f"   Spline points: {len(x_s)}")
+        with (nullcontext() if args.no_store else ResultStore(args.store)) as store:
+            # Load track data
+            print(f"📍 Loading track: {args.track}")
+            optimizer = GeneticOptimizer(args.config, seed=args.seed, run_index=args.run_index)
+            if args.open:
+                optimizer.config.closed = False
+            if args.entry_speed is not None:
+                optimizer.config.entry_speed = args.entry_speed
+            if args.exit_speed is not None:
+                optimizer.config.exit_speed = args.exit_speed
+
+            x, y = load_waypoints(args.track)
+            x_s, y_s = build_spline(x, y, num_points=args.points,
+                                    closed=optimizer.config.closed)
+            print(f"   Original waypoints: {len(x)}")
+            print(f"   Spline points: {len(x_s)}")
         
-        # Run optimization
-        print(f"⚙️  Using config: {args.config}")
-        results = FindBestLap(x_s, y_s, config_path=args.config)
+            # Warm-start from previous runs on the same (or a similar) track,
+            # restricted to runs whose fitness is comparable with this one
+            t_hash = track_hash(x, y)
+            seeds = []
+            if store is not None and args.warm_start > 0:
+                seeds = store.best_genomes(t_hash, x_s, y_s,
+                                           gene_count=optimizer.config.gene_count,
+                                           limit=args.warm_start,
+                                           fitness=fitness_key(VEHICLE_DEFAULTS,
+                                                               asdict(optimizer.config)))
+                print(f"♻️  Warm-start genomes: {len(seeds)}")
+
+            # Deterministic DP line as an extra seed (placed first). The DP grid
+            # spans the gene bounds at a fixed 0.1 m resolution; the seed is only
+            # used if its genes (in this run's encoding) beat the centerline
+            if args.dp_seed:
+                cfg = optimizer.config
+                line = dp_racing_line(x_s, y_s, offset_min=cfg.gene_min,
+                                      offset_max=cfg.gene_max,
+                                      objective=args.dp_objective, closed=cfg.closed)
+                genes = line.genes(cfg.gene_count, cfg.gene_min, cfg.gene_max,
+                                   interpolation=cfg.interpolation)
+                track = dict(closed=cfg.closed, v_entry=cfg.entry_speed,
+                             v_exit=cfg.exit_speed, interpolation=cfg.interpolation)
+                seed_time = evaluate(genes, x_s, y_s, **track)[0]
+                baseline = evaluate([0.0] * cfg.gene_count, x_s, y_s, **track)[0]
+                if seed_time < baseline:
+                    seeds = [genes] + seeds
+                    print(f"🧭 DP racing line ({args.dp_objective}) added as seed: "
+                          f"{seed_time:.3f}s (centerline {baseline:.3f}s)")
+                else:
+                    print(f"⚠️  DP seed skipped: {seed_time:.3f}s is not faster than the "
+                          f"centerline ({baseline:.3f}s) with {cfg.interpolation} genes "
+                          f"(try individual.interpolation: cubic)")
+
+            # Run optimization
+            print(f"⚙️  Using config: {args.config}")
+            results = optimizer.FindBestLap(x_s, y_s, seed_individuals=seeds)
         
-        # Display results summary
-        print("\n📊 RESULTS SUMMARY")
-        print("=" * 40)
-        print(f"🥇 Best lap time: {results[0].lap_time:.3f}s")
-        print(f"🏆 Hall of Fame size: {len(results)}")
+            # Display results summary
+            print("\n📊 RESULTS SUMMARY")
+            print("=" * 40)
+            print(f"🥇 Best lap time: {results[0].lap_time:.3f}s")
+            print(f"🏆 Hall of Fame size: {len(results)}")
         
-        # Save best individual to file
-        best_result = results[0]
-        output_file = "outputs/best_individual.txt"
-        os.makedirs("outputs", exist_ok=True)
+            # Save best individual to file
+            best_result = results[0]
+            output_file = "outputs/best_individual.txt"
+            os.makedirs("outputs", exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            f.write(f"Best Lap Time: {best_result.lap_time:.6f}s\n")
-            f.write(f"Generation: {best_result.generation}\n")
-            f.write(f"Individual: {best_result.individual}\n")
-            f.write("\nTop 5 Results:\n")
-            for i, result in enumerate(results):
-                f.write(f"{i+1}. {result.lap_time:.6f}s (Gen {result.generation})\n")
+            with open(output_file, 'w') as f:
+                f.write(f"Best Lap Time: {best_result.lap_time:.6f}s\n")
+                f.write(f"Generation: {best_result.generation}\n")
+                f.write(f"Individual: {best_result.individual}\n")
+                f.write("\nTop 5 Results:\n")
+                for i, result in enumerate(results):
+                    f.write(f"{i+1}. {result.lap_time:.6f}s (Gen {result.generation})\n")
         
-        print(f"💾 Results saved to: {output_file}")
+            print(f"💾 Results saved to: {output_file}")
+
+            if store is not None:
+                # Store the seed actually used, so an unseeded run can be replayed
+                config = {**asdict(optimizer.config), "seed": optimizer.run_seed}
+                run_id = store.save_run(t_hash, x_s, y_s, VEHICLE_DEFAULTS,
+                                        config, results,
+                                        optimizer.history,
+                                        evaluations=optimizer.evaluations,
+                                        elapsed=optimizer.elapsed)
+                print(f"🗄️  Run #{run_id} stored in: {args.store}")
         
-        if not args.quiet:
-            logger.info(f"Optimization completed. Best time: {best_result.lap_time:.3f}s")
+            if not args.quiet:
+                logger.info(f"Optimization completed. Best time: {best_result.lap_time:.3f}s")
             
     except Exception as e:
         print(f"❌ Error: {e}")
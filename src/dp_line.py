@@ -0,0 +1,237 @@
+# src/dp_line.py
+"""
+Deterministic racing-line search by dynamic programming.
+
+The centerline is sampled at n_stations stations; at each station the line
+may sit at any lateral offset of a grid with spacing `resolution` along the
+centerline normal (the same normals used by step3_evaluation.offset_trajectory). Curvature needs
+three consecutive points, so the DP state is the pair (previous offset,
+current offset). Transitions whose lateral change between stations exceeds
+max_step are pruned, which keeps the state space banded:
+n_offsets x (2K+1) states with (2K+1) transitions each, solved with numpy
+one station at a time.
+
+Objectives:
+  "curvature": sum of kappa² · ds (minimum-curvature line)
+  "time":      sum of (kappa² + length_weight) · ds, the usual shortest-time
+               compromise between a minimum-curvature line (higher corner
+               speeds) and the shortest path (less distance). A quasi-steady
+               ds / sqrt(mu·g/kappa) cost is concave in kappa and pushes all
+               the turning into a few sharp kinks, so it is not used.
+
+Closed tracks are solved in two passes: an open pass gives the offsets of the
+first two stations, then a second pass fixes that pair at both ends so the
+line closes smoothly on itself. The result converts to GA genes and can seed
+GeneticOptimizer.FindBestLap(seed_individuals=...). Use the "cubic" gene
+interpolation for that: piecewise-linear genes put a kink at every gene and
+cannot follow the line (10 linear genes sampled from a 19.8 s DP line lap in
+24.4 s on the S track, 10 cubic genes in 20.7 s).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from step3_evaluation import centerline_normals, offset_trajectory, gene_knots
+
+DP_OBJECTIVES = ("curvature", "time")
+
+@dataclass
+class DPLine:
+    """Result of the DP search: offsets per station and the full-resolution line."""
+    stations: np.ndarray     # spline node index of each station
+    offsets: np.ndarray      # lateral offset (m) at each station
+    cost: float              # DP objective value
+    x: np.ndarray            # racing line at spline resolution
+    y: np.ndarray
+    closed: bool = True
+
+    def offsets_at(self, u: np.ndarray) -> np.ndarray:
+        """Smooth lateral offset of the line at track parameter u in [0, 1]."""
+        smooth = CubicSpline(self.stations / self.stations[-1], self.offsets,
+                             bc_type="periodic" if self.closed else "not-a-knot")
+        return smooth(u)
+
+    def genes(self, gene_count: int = 10, gene_min: float = None,
+              gene_max: float = None, interpolation: str = "linear") -> list:
+        """
+        GA genes sampled from the line at the knots of the given gene
+        interpolation (optionally clipped to the gene bounds).
+        """
+        genes = self.offsets_at(gene_knots(gene_count, self.closed, interpolation))
+        if gene_min is not None or gene_max is not None:
+            genes = np.clip(genes, gene_min, gene_max)
+        return genes.tolist()
+
+def _transition_costs(pa, pb, pc, objective, length_weight):
+    """Cost of passing through pb between pa and pc (arrays of points, last axis xy)."""
+    v1, v2, v3 = pb - pa, pc - pb, pc - pa
+    l1 = np.hypot(v1[..., 0], v1[..., 1])
+    l2 = np.hypot(v2[..., 0], v2[..., 1])
+    l3 = np.hypot(v3[..., 0], v3[..., 1])
+    cross = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+    # Menger curvature of the three points
+    kappa = 2 * np.abs(cross) / np.maximum(l1 * l2 * l3, 1e-12)
+    ds = (l1 + l2) / 2
+    if objective == "curvature":
+        return kappa**2 * ds
+    return (kappa**2 + length_weight) * ds
+
+def _solve(points, seq, K, objective, length_weight, fixed=None):
+    """
+    Banded DP over the station sequence seq. State (b, d): current offset b,
+    previous offset b - (d - K). fixed=(a0, b1) pins the first two and the
+    last two offsets. Returns (offset index per position, cost).
+    """
+    L = points.shape[1]
+    steps = np.arange(-K, K + 1)
+    b = np.arange(L)[:, None, None]
+    d = steps[None, :, None]
+    e = steps[None, None, :]
+    a_idx, c_idx = b - d, b + e
+    valid = (a_idx >= 0) & (a_idx < L) & (c_idx >= 0) & (c_idx < L)
+    a_idx, c_idx = np.clip(a_idx, 0, L - 1), np.clip(c_idx, 0, L - 1)
+    b_idx = np.broadcast_to(b, valid.shape)
+
+    # Scatter target of each (b, e): new state (c = b + e, e)
+    b2, e2 = np.meshgrid(np.arange(L), np.arange(2 * K + 1), indexing="ij")
+    c2 = b2 + steps[e2]
+    ok = (c2 >= 0) & (c2 < L)
+
+    cost = np.full((L, 2 * K + 1), np.inf)
+    if fixed is None:
+        prev = np.arange(L)[:, None] - steps[None, :]
+        cost[(prev >= 0) & (prev < L)] = 0.0
+    else:
+        a0, b1 = fixed
+        if abs(b1 - a0) > K:
+            raise ValueError("fixed start offsets violate max_step")
+        cost[b1, b1 - a0 + K] = 0.0
+
+    backptr = []
+    for j in range(2, len(seq)):
+        A, B, C = seq[j - 2], seq[j - 1], seq[j]
+        step = _transition_costs(points[A][a_idx], points[B][b_idx], points[C][c_idx],
+                                 objective, length_weight)
+        total = np.where(valid, cost[:, :, None] + step, np.inf)
+        arg = np.argmin(total, axis=1)
+        best = np.take_along_axis(total, arg[:, None, :], axis=1)[:, 0, :]
+
+        cost = np.full((L, 2 * K + 1), np.inf)
+        bp = np.zeros((L, 2 * K + 1), dtype=int)
+        cost[c2[ok], e2[ok]] = best[ok]
+        bp[c2[ok], e2[ok]] = arg[ok]
+        backptr.append(bp)
+
+    if fixed is None:
+        c, e = np.unravel_index(np.argmin(cost), cost.shape)
+    else:
+        c, e = b1, b1 - a0 + K
+    total_cost = float(cost[c, e])
+    if not np.isfinite(total_cost):
+        raise ValueError("no feasible line: increase max_step or the offset range")
+
+    path = [c, c - steps[e]]
+    for bp in reversed(backptr):
+        prev_d = bp[c, e]
+        c, e = c - steps[e], prev_d
+        path.append(c - steps[e])
+    return np.array(path[::-1]), total_cost
+
+def dp_racing_line(x_s: np.ndarray, y_s: np.ndarray,
+                   n_stations: int = 100,
+                   offset_min: float = -2.0,
+                   offset_max: float = 2.0,
+                   resolution: float = 0.1,
+                   max_step: float = 0.5,
+                   objective: str = "time",
+                   closed: bool = True,
+                   length_weight: float = 1e-3) -> DPLine:
+    """
+    Racing line minimizing `objective` over a grid of lateral offsets.
+
+    Args:
+        n_stations: stations along the centerline (closed tracks: the last
+                    station is the closing node, equal to the first)
+        offset_min/max: lateral range of the grid in metres (the usable
+                        half-width of the track, e.g. the GA gene bounds)
+        resolution: grid spacing in metres. Keep it fixed when widening the
+                    range: a coarser grid gives a visibly worse line
+        max_step: largest lateral change between consecutive stations (m)
+        length_weight: distance weight of the "time" objective (1/m²; curvature
+                       below sqrt(length_weight) counts less than distance)
+    """
+    if objective not in DP_OBJECTIVES:
+        raise ValueError(f"Unknown DP objective: {objective}")
+
+    stations = np.linspace(0, len(x_s) - 1, n_stations).round().astype(int)
+    n_offsets = int(round((offset_max - offset_min) / resolution)) + 1
+    grid = np.linspace(offset_min, offset_max, n_offsets)
+    K = max(1, int(np.ceil(max_step / (grid[1] - grid[0]) - 1e-9)))
+
+    nx, ny = centerline_normals(x_s, y_s)
+    points = np.stack([
+        x_s[stations, None] + grid[None, :] * nx[stations, None],
+        y_s[stations, None] + grid[None, :] * ny[stations, None],
+    ], axis=-1)
+
+    if closed:
+        # The closing station duplicates station 0: solve over the unique
+        # stations and wrap around through stations 0 and 1 again.
+        unique = n_stations - 1
+        seq = list(range(unique)) + [0, 1]
+        first, _ = _solve(points, seq, K, objective, length_weight)
+        path, cost = _solve(points, seq, K, objective, length_weight,
+                            fixed=(first[0], first[1]))
+        idx = np.append(path[:unique], path[0])
+    else:
+        idx, cost = _solve(points, list(range(n_stations)), K, objective, length_weight)
+
+    offsets = grid[idx]
+    line = DPLine(stations=stations, offsets=offsets, cost=cost,
+                  x=None, y=None, closed=closed)
+    # Smooth (C2) interpolation between stations: a piecewise-linear line
+    # would put curvature spikes at every station
+    full = line.offsets_at(np.arange(len(x_s)) / (len(x_s) - 1))
+    line.x, line.y = offset_trajectory(full, x_s, y_s)
+    return line
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from track_loader import load_waypoints, build_spline
+    from dynamics import compute_lap_profile
+    from step3_evaluation import evaluate, GENE_INTERPOLATIONS
+
+    parser = argparse.ArgumentParser(description="Racing line by dynamic programming")
+    parser.add_argument("--track", "-t", default="tracks/waypoints_S.csv")
+    parser.add_argument("--points", "-p", type=int, default=500)
+    parser.add_argument("--stations", type=int, default=100)
+    parser.add_argument("--offset-min", type=float, default=-2.0)
+    parser.add_argument("--offset-max", type=float, default=2.0)
+    parser.add_argument("--resolution", type=float, default=0.1, help="Offset grid spacing (m)")
+    parser.add_argument("--max-step", type=float, default=0.5)
+    parser.add_argument("--objective", choices=DP_OBJECTIVES, default="time")
+    parser.add_argument("--length-weight", type=float, default=1e-3)
+    parser.add_argument("--genes", type=int, default=10)
+    parser.add_argument("--interpolation", choices=GENE_INTERPOLATIONS, default="cubic",
+                        help="Gene encoding used to report the GA seed")
+    args = parser.parse_args()
+
+    x_s, y_s = build_spline(*load_waypoints(args.track), num_points=args.points)
+    start = time.perf_counter()
+    line = dp_racing_line(x_s, y_s, n_stations=args.stations,
+                          offset_min=args.offset_min, offset_max=args.offset_max,
+                          resolution=args.resolution,
+                          max_step=args.max_step, objective=args.objective,
+                          length_weight=args.length_weight)
+    elapsed = time.perf_counter() - start
+
+    genes = line.genes(args.genes, interpolation=args.interpolation)
+    print(f"🧭 DP line ({args.objective}) solved in {elapsed:.2f}s")
+    print(f"   Centerline:       {compute_lap_profile(x_s, y_s).lap_time:.3f}s")
+    print(f"   DP line:          {compute_lap_profile(line.x, line.y).lap_time:.3f}s")
+    print(f"   DP genes ({args.genes:>2}, {args.interpolation}): "
+          f"{evaluate(genes, x_s, y_s, interpolation=args.interpolation)[0]:.3f}s")
+    print(f"   Genes: {np.round(genes, 3).tolist()}")
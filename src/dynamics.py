@@ -1,6 +1,10 @@
 # src/dynamics.py
 
 import numpy as np
+from dataclasses import dataclass
+
+# Default vehicle/grip parameters used by compute_lap_time
+VEHICLE_DEFAULTS = {"mu": 1.1, "g": 9.81, "a_max": 2.5, "a_min": -5.0}
 
 def compute_curvature(x: np.ndarray, y: np.ndarray) -> np.ndarray:
     """
@@ -27,64 +31,300 @@ def compute_speed_limits(curvature: np.ndarray,
     Given curvature array, compute the max cornering speed:
        v_max = sqrt(mu * g / κ)
     For κ=0 (straight), we set a high cap.
+    An array of S friction coefficients gives an (S, N) batch of limits.
     """
+    mu = np.asarray(mu, dtype=float)[..., None] if np.ndim(mu) else mu
     v_max = np.sqrt(mu * g / np.maximum(curvature, 1e-8))
     return v_max
 
-def compute_segment_lengths(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+def compute_segment_lengths(x: np.ndarray, y: np.ndarray,
+                            closed: bool = True) -> np.ndarray:
     """
-    Compute Euclidean distance between successive points,
-    assuming closed-loop (last→first).
+    Compute Euclidean distance between successive points.
+    Closed loop: ds[-1] is the last→first segment. Open track: ds[-1] = 0,
+    so arrays keep one entry per node.
     """
-    dx = np.diff(x, append=x[0])
-    dy = np.diff(y, append=y[0])
+    dx = np.diff(x, append=x[0] if closed else x[-1])
+    dy = np.diff(y, append=y[0] if closed else y[-1])
     return np.hypot(dx, dy)
 
 def speed_profile_two_pass(v_limit: np.ndarray,
                            ds: np.ndarray,
                            a_max: float = 2.5,
-                           a_min: float = -5.0) -> np.ndarray:
+                           a_min: float = -5.0,
+                           closed: bool = True,
+                           v_entry: float = None,
+                           v_exit: float = None) -> np.ndarray:
     """
     Build a velocity profile along the track:
       1. Forward pass (acceleration limit)
       2. Backward pass (braking limit)
     Returns v[i] at each node.
+
+    Closed loop: the node with the lowest v_limit is always corner-bound
+    (the constant profile at that speed is feasible), so the arrays are
+    rotated to start there, the backward pass also covers the wrap segment
+    back to it, and a single pair of passes gives the exact periodic profile.
+    Open track: v_entry / v_exit (optional) cap the first and last node.
+
+    A 2D v_limit of shape (S, N) is solved for all S parameter samples at
+    once (a_max/a_min may then be arrays of length S): the loop runs over
+    nodes only, each step vectorized across samples.
     """
+    if np.ndim(v_limit) == 2:
+        return _speed_profile_batch(v_limit, ds, a_max, a_min,
+                                    closed, v_entry, v_exit)
     n = len(v_limit)
-    v = v_limit.copy()
+    if closed:
+        start = int(np.argmin(v_limit))
+        v = np.roll(v_limit, -start)
+        ds = np.roll(ds, -start)
+    else:
+        v = v_limit.copy()
+        if v_entry is not None:
+            v[0] = min(v[0], v_entry)
+        if v_exit is not None:
+            v[-1] = min(v[-1], v_exit)
+
     # Forward pass: acceleration
     for i in range(1, n):
         v_prev = v[i-1]
         v[i] = min(v[i], np.sqrt(v_prev**2 + 2*a_max*ds[i-1]))
-    # Backward pass: braking
+    # Backward pass: braking (closed loop: starting from the wrap segment
+    # ds[-1] back into node 0)
+    if closed:
+        v[-1] = min(v[-1], np.sqrt(v[0]**2 + 2*abs(a_min)*ds[-1]))
     for i in range(n-2, -1, -1):
         v_next = v[i+1]
         v[i] = min(v[i], np.sqrt(v_next**2 + 2*abs(a_min)*ds[i]))
-    # ensure closure: last vs first
-    v[0] = v[-1] = min(v[0], v[-1])
-    return v
+    return np.roll(v, start) if closed else v
 
-def compute_lap_time(x: np.ndarray,
-                     y: np.ndarray,
-                     mu: float = 1.1,
-                     g: float = 9.81,
-                     a_max: float = 2.5,
-                     a_min: float = -5.0) -> float:
+def _speed_profile_batch(v_limit: np.ndarray,
+                         ds: np.ndarray,
+                         a_max,
+                         a_min,
+                         closed: bool = True,
+                         v_entry: float = None,
+                         v_exit: float = None) -> np.ndarray:
+    """Two-pass profile for an (S, N) batch of speed limits."""
+    n = v_limit.shape[1]
+    two_a = 2 * np.broadcast_to(np.asarray(a_max, dtype=float), v_limit.shape[:1])
+    two_b = 2 * np.abs(np.broadcast_to(np.asarray(a_min, dtype=float), v_limit.shape[:1]))
+    if closed:
+        # Each sample starts at its own slowest node (see speed_profile_two_pass)
+        order = (np.argmin(v_limit, axis=1)[:, None] + np.arange(n)) % n
+        v = np.take_along_axis(v_limit, order, axis=1)
+        ds = ds[order]
+    else:
+        v = v_limit.copy()
+        ds = np.broadcast_to(ds, v.shape)
+        if v_entry is not None:
+            np.minimum(v[:, 0], v_entry, out=v[:, 0])
+        if v_exit is not None:
+            np.minimum(v[:, -1], v_exit, out=v[:, -1])
+
+    # Forward pass: acceleration
+    for i in range(1, n):
+        np.minimum(v[:, i], np.sqrt(v[:, i-1]**2 + two_a*ds[:, i-1]), out=v[:, i])
+    # Backward pass: braking
+    if closed:
+        np.minimum(v[:, -1], np.sqrt(v[:, 0]**2 + two_b*ds[:, -1]), out=v[:, -1])
+    for i in range(n-2, -1, -1):
+        np.minimum(v[:, i], np.sqrt(v[:, i+1]**2 + two_b*ds[:, i]), out=v[:, i])
+    if not closed:
+        return v
+    out = np.empty_like(v)
+    np.put_along_axis(out, order, v, axis=1)
+    return out
+
+@dataclass
+class LapProfile:
+    """
+    Per-node result of one lap simulation.
+
+    Segment arrays (ds, dt) describe the stretch from node i to node i+1.
+    a_long[i] is the longitudinal acceleration on the segment arriving at
+    node i. The *_limited flags tell which constraint binds at each node.
+    """
+    kappa: np.ndarray
+    v_limit: np.ndarray
+    ds: np.ndarray
+    v: np.ndarray
+    dt: np.ndarray
+    t_cum: np.ndarray
+    a_long: np.ndarray
+    a_lat: np.ndarray
+    corner_limited: np.ndarray
+    accel_limited: np.ndarray
+    brake_limited: np.ndarray
+
+    @property
+    def lap_time(self) -> float:
+        return float(np.sum(self.dt))
+
+    def sector_times(self, n_sectors: int = 3) -> np.ndarray:
+        """
+        Time spent in n_sectors splits of equal node count. Splitting by node
+        index keeps sectors comparable between lines offset from the same
+        centerline.
+        """
+        bounds = np.linspace(0, len(self.dt), n_sectors + 1).round().astype(int)
+        return np.add.reduceat(self.dt, bounds[:-1])
+
+    def segment_limits(self) -> np.ndarray:
+        """
+        One label per segment (node i → i+1): "accel", "brake", "corner" or
+        "free" (no constraint binding, e.g. easing off between limits).
+        """
+        # accel flags describe the arriving segment, brake flags the departing one
+        accel = np.roll(self.accel_limited, -1)
+        brake = self.brake_limited & ~accel
+        corner = (self.corner_limited | np.roll(self.corner_limited, -1)) & ~accel & ~brake
+        labels = np.full(len(self.dt), "free", dtype=object)
+        labels[corner] = "corner"
+        labels[brake] = "brake"
+        labels[accel] = "accel"
+        return labels
+
+    def limit_time_breakdown(self) -> dict:
+        """Lap time split by the constraint binding on each segment (sums to lap_time)."""
+        labels = self.segment_limits()
+        return {name: float(np.sum(self.dt[labels == name]))
+                for name in ("corner", "accel", "brake", "free")}
+
+def compute_lap_profile(x: np.ndarray,
+                        y: np.ndarray,
+                        mu: float = 1.1,
+                        g: float = 9.81,
+                        a_max: float = 2.5,
+                        a_min: float = -5.0,
+                        closed: bool = True,
+                        v_entry: float = None,
+                        v_exit: float = None) -> LapProfile:
     """
-    Full lap-time estimation:
+    Full lap simulation in one pass:
       1. curvature → v_limit
       2. segment lengths ds
-      3. two-pass speed profile
-      4. trapezoidal integration of time: sum(ds / v_avg)
+      3. two-pass speed profile (periodic, or open with entry/exit speeds)
+      4. trapezoidal time per segment: ds / v_avg
+      5. longitudinal/lateral acceleration and binding constraints
     """
     curvature = compute_curvature(x, y)
     v_limit = compute_speed_limits(curvature, mu, g)
-    ds = compute_segment_lengths(x, y)
-    v_profile = speed_profile_two_pass(v_limit, ds, a_max, a_min)
+    ds = compute_segment_lengths(x, y, closed)
+    v_profile = speed_profile_two_pass(v_limit, ds, a_max, a_min,
+                                       closed, v_entry, v_exit)
+
     # time per segment: ds / v_avg between nodes
     v_next = np.roll(v_profile, -1)
-    time_segments = ds / ((v_profile + v_next) / 2 + 1e-8)
-    return np.sum(time_segments)
+    dt = ds / ((v_profile + v_next) / 2 + 1e-8)
+    t_cum = np.concatenate([[0.0], np.cumsum(dt)[:-1]])
+
+    # a = dv/dt over the arriving segment = (v_i² - v_{i-1}²) / (2 ds_{i-1})
+    # (zero-length segments, e.g. a duplicated closing node, carry no acceleration)
+    v_prev = np.roll(v_profile, 1)
+    ds_prev = np.roll(ds, 1)
+    a_long = np.where(ds_prev > 1e-6,
+                      (v_profile**2 - v_prev**2) / (2 * np.maximum(ds_prev, 1e-6)), 0.0)
+    a_lat = v_profile**2 * curvature
+
+    corner = np.isclose(v_profile, v_limit, rtol=1e-6)
+    accel = ~corner & np.isclose(a_long, a_max, rtol=1e-3)
+    brake = ~corner & ~accel & np.isclose(np.roll(a_long, -1), a_min, rtol=1e-3)
+
+    return LapProfile(kappa=curvature, v_limit=v_limit, ds=ds, v=v_profile,
+                      dt=dt, t_cum=t_cum, a_long=a_long, a_lat=a_lat,
+                      corner_limited=corner, accel_limited=accel,
+                      brake_limited=brake)
+
+# Objectives available to the multi-objective optimizer (all minimized)
+LINE_OBJECTIVES = ("lap_time", "steering_smoothness", "mean_lateral_g",
+                   "friction_usage", "limit_fraction")
+
+def line_objectives(profile: LapProfile,
+                    mu: float = 1.1,
+                    g: float = 9.81) -> dict:
+    """
+    Secondary line-quality metrics from the per-node arrays of a LapProfile.
+    Peak values are useless here: every lap has a corner-limited node, so
+    max |a_lat| is always mu·g. The metrics are time-weighted instead:
+      steering_smoothness: RMS rate of change of curvature along the line (1/m²)
+      mean_lateral_g:      time-averaged |a_lat| / g
+      friction_usage:      time-weighted RMS of combined acceleration / (mu g);
+                           lower means more margin to the friction limit
+      limit_fraction:      share of the lap time spent on corner- or
+                           brake-limited (grip-bound) segments
+    """
+    valid = profile.ds > 1e-6
+    dkappa = np.diff(profile.kappa, append=profile.kappa[0])[valid] / profile.ds[valid]
+    combined = np.hypot(profile.a_long, profile.a_lat)
+    # Node weights: half of the arriving and half of the departing segment time
+    w = (profile.dt + np.roll(profile.dt, 1)) / 2
+    w = w / np.sum(w)
+    labels = profile.segment_limits()
+    grip_bound = (labels == "corner") | (labels == "brake")
+    return {
+        "lap_time": profile.lap_time,
+        "steering_smoothness": float(np.sqrt(np.mean(dkappa**2))),
+        "mean_lateral_g": float(np.sum(w * np.abs(profile.a_lat)) / g),
+        "friction_usage": float(np.sqrt(np.sum(w * combined**2)) / (mu * g)),
+        "limit_fraction": float(np.sum(profile.dt[grip_bound]) / profile.lap_time),
+    }
+
+def sample_vehicle_params(rng: np.random.Generator,
+                          n_samples: int,
+                          mu_std: float = 0.1,
+                          a_max_std: float = 0.2,
+                          a_min_std: float = 0.5,
+                          base: dict = None) -> dict:
+    """
+    Draw n_samples vehicle/grip parameter sets around the nominal values
+    (Gaussian, clipped to physically valid ranges).
+    """
+    base = base or VEHICLE_DEFAULTS
+    return {
+        "mu": np.clip(rng.normal(base["mu"], mu_std, n_samples), 0.1, None),
+        "a_max": np.clip(rng.normal(base["a_max"], a_max_std, n_samples), 0.1, None),
+        "a_min": np.clip(rng.normal(base["a_min"], a_min_std, n_samples), None, -0.1),
+    }
+
+def compute_lap_times_batch(x: np.ndarray,
+                            y: np.ndarray,
+                            mu,
+                            a_max,
+                            a_min,
+                            g: float = 9.81,
+                            closed: bool = True,
+                            v_entry: float = None,
+                            v_exit: float = None) -> np.ndarray:
+    """
+    Lap time of one line for S parameter samples in a single vectorized call.
+    Curvature and segment lengths are shared; mu, a_max, a_min are arrays of
+    length S. Returns an array of S lap times.
+    """
+    curvature = compute_curvature(x, y)
+    ds = compute_segment_lengths(x, y, closed)
+    v_limit = compute_speed_limits(curvature, np.atleast_1d(mu), g)
+    v = speed_profile_two_pass(v_limit, ds, a_max, a_min, closed, v_entry, v_exit)
+    v_next = np.roll(v, -1, axis=1)
+    return np.sum(ds / ((v + v_next) / 2 + 1e-8), axis=1)
+
+def compute_lap_time(x: np.ndarray,
+                     y: np.ndarray,
+                     mu: float = 1.1,
+                     g: float = 9.81,
+                     a_max: float = 2.5,
+                     a_min: float = -5.0,
+                     closed: bool = True,
+                     v_entry: float = None,
+                     v_exit: float = None) -> float:
+    """
+    Lap time in seconds (see compute_lap_profile for the full breakdown).
+    closed=False simulates a point-to-point run (hill climb, stage segment)
+    with optional entry/exit speeds in m/s.
+    """
+    return compute_lap_profile(x, y, mu, g, a_max, a_min,
+                               closed, v_entry, v_exit).lap_time
 
 # Quick self-test
 if __name__ == "__main__":
@@ -92,5 +332,7 @@ if __name__ == "__main__":
     # load & spline
     x, y = load_waypoints("tracks/waypoints_S.csv")
     x_s, y_s = build_spline(x, y, num_points=500)
-    t0 = compute_lap_time(x_s, y_s)
-    print(f"Estimated lap time (s): {t0:.2f}")
+    profile = compute_lap_profile(x_s, y_s)
+    print(f"Estimated lap time (s): {profile.lap_time:.2f}")
+    print(f"Sector times (s): {np.round(profile.sector_times(), 2)}")
+    print(f"Time by limit (s): {profile.limit_time_breakdown()}")
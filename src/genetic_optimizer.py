@@ -1,15 +1,20 @@
 # src/genetic_optimizer.py
 
-import random
+import time
 import numpy as np
 import yaml
 import os
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from functools import partial
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from deap import tools
 
 # Import existing modules
-from step5_toolbox import toolbox
+from dynamics import LINE_OBJECTIVES, sample_vehicle_params
+from step3_evaluation import evaluate_multi, evaluate_robust
+from step4_setup_deap import creator, multi_objective_types
+from step5_toolbox import make_toolbox, sel_tournament_dcd
 
 @dataclass
 class GAConfig:
@@ -33,6 +38,51 @@ class GAConfig:
     show_statistics: bool
     show_hall_of_fame: bool
 
+    # Execution
+    mode: str = "generational"   # "generational" or "steady_state"
+    workers: int = 1             # evaluation processes (0 = all cores)
+    tournament_size: int = 3
+    elite_size: int = 0                 # Best individuals copied unchanged (fitness cached)
+    stagnation_generations: int = 0     # Reinject archived lines after N gens without a new best (0 = off)
+    reinject_count: int = 0             # Archived lines reinjected on stagnation
+    reinject_archive_size: int = 20     # Best distinct lines kept as reinjection candidates
+
+    # Gene encoding: "linear" offsets between genes, or a smooth "cubic" spline
+    interpolation: str = "linear"
+
+    # Objective
+    objective_mode: str = "single"  # "single" or "nsga2" (Pareto front)
+    objectives: Tuple[str, ...] = LINE_OBJECTIVES
+
+    # Operator adaptation
+    adaptation: str = "none"        # "none", "one_fifth" or "self_adaptive"
+    sigma: float = 0.5              # Initial Gaussian mutation step (m)
+    indpb: float = 0.2              # Per-gene mutation probability
+    sigma_min: float = 0.01
+    sigma_max: float = 2.0
+    diversity_control: bool = False  # Scale mutation/crossover rates by diversity
+    target_diversity: float = 0.3    # Diversity (vs. initial) below which rates adapt
+
+    # Reproducibility: all stochastic operators draw from streams derived
+    # from (seed, run_index); distinct run_index values give independent runs.
+    # seed None draws fresh entropy on every run (see GeneticOptimizer.run_seed)
+    seed: Optional[int] = None
+    run_index: int = 0
+
+    # Track topology: closed loop, or open (point-to-point) with entry/exit speeds
+    closed: bool = True
+    entry_speed: Optional[float] = None   # m/s, open tracks only
+    exit_speed: Optional[float] = None    # m/s, open tracks only
+
+    # Robust fitness over sampled vehicle/grip parameters
+    robust: bool = False
+    robust_samples: int = 32
+    robust_statistic: str = "mean"   # "mean" or "quantile"
+    robust_quantile: float = 0.9
+    robust_mu_std: float = 0.1
+    robust_a_max_std: float = 0.2
+    robust_a_min_std: float = 0.5
+
 @dataclass 
 class LapResult:
     """Result of lap optimization"""
@@ -40,13 +90,54 @@ class LapResult:
     lap_time: float
     generation: int
     rank: int
+    objectives: Optional[Dict[str, float]] = None  # NSGA-II mode only
+
+# Worker-side state: each evaluation process receives the track once through the
+# pool initializer instead of pickling it with every submitted individual.
+_WORKER_STATE: Dict[str, Any] = {}
+
+def _init_worker(evaluate_fn, x_s: np.ndarray, y_s: np.ndarray):
+    """Pool initializer: keep the evaluation function and track in the worker"""
+    _WORKER_STATE['evaluate'] = evaluate_fn
+    _WORKER_STATE['track'] = (x_s, y_s)
+
+def _evaluate_genes(genes: List[float]) -> Tuple[float, ...]:
+    """Evaluate a plain gene list inside a worker"""
+    x_s, y_s = _WORKER_STATE['track']
+    return _WORKER_STATE['evaluate'](genes, x_s, y_s)
+
+class _InlineExecutor:
+    """Executor stand-in that evaluates synchronously (workers == 1)"""
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def map(self, fn, *iterables, chunksize=1):
+        return map(fn, *iterables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
 
 class GeneticOptimizer:
     """Genetic Algorithm for Lap Time Optimization"""
     
-    def __init__(self, config_path: str = "config/genetic_algorithm.yaml"):
-        """Initialize optimizer with configuration file"""
+    def __init__(self, config_path: str = "config/genetic_algorithm.yaml",
+                 seed: Optional[int] = None, run_index: Optional[int] = None):
+        """Initialize optimizer with configuration file (seed/run_index override it)"""
         self.config = self._load_config(config_path)
+        if seed is not None:
+            self.config.seed = seed
+        if run_index is not None:
+            self.config.run_index = run_index
+        self.run_seed: Optional[int] = None  # Seed of the last FindBestLap run
         
     def _load_config(self, config_path: str) -> GAConfig:
         """Load configuration from YAML file"""
@@ -68,6 +159,23 @@ class GeneticOptimizer:
             
         with open(config_file, 'r') as f:
             config_data = yaml.safe_load(f)
+
+        # lap_time is always optimized and always reported first
+        objective = config_data.get('objective', {})
+        if objective.get('mode', 'single') not in ("single", "nsga2"):
+            raise ValueError(f"Unknown objective mode: {objective['mode']}")
+        objectives = [name for name in objective.get('objectives', LINE_OBJECTIVES)
+                      if name != 'lap_time']
+        unknown = set(objectives) - set(LINE_OBJECTIVES)
+        if unknown:
+            raise ValueError(f"Unknown objectives: {sorted(unknown)}. Available: {LINE_OBJECTIVES}")
+        robust = config_data.get('robust', {})
+        if robust.get('statistic', 'mean') not in ("mean", "quantile"):
+            raise ValueError(f"Unknown robust statistic: {robust['statistic']}")
+        track = config_data.get('track', {})
+        adaptation = config_data.get('adaptation', {})
+        if adaptation.get('mode', 'none') not in ("none", "one_fifth", "self_adaptive"):
+            raise ValueError(f"Unknown adaptation mode: {adaptation['mode']}")
             
         return GAConfig(
             pop_size=config_data['population']['size'],
@@ -78,110 +186,519 @@ class GeneticOptimizer:
             gene_count=config_data['individual']['gene_count'],
             gene_min=config_data['individual']['gene_bounds']['min'],
             gene_max=config_data['individual']['gene_bounds']['max'],
+            interpolation=config_data['individual'].get('interpolation', 'linear'),
             show_progress=config_data['logging']['show_progress'],
             show_statistics=config_data['logging']['show_statistics'],
-            show_hall_of_fame=config_data['logging']['show_hall_of_fame']
+            show_hall_of_fame=config_data['logging']['show_hall_of_fame'],
+            mode=config_data['evolution'].get('mode', 'generational'),
+            workers=config_data['evolution'].get('workers', 1),
+            tournament_size=config_data.get('advanced', {}).get('tournament_size', 3),
+            elite_size=config_data.get('advanced', {}).get('elite_size', 0),
+            stagnation_generations=config_data.get('advanced', {}).get('stagnation_generations', 0),
+            reinject_count=config_data.get('advanced', {}).get('reinject_count', 0),
+            reinject_archive_size=config_data.get('advanced', {}).get('reinject_archive_size', 20),
+            objective_mode=objective.get('mode', 'single'),
+            objectives=('lap_time', *objectives),
+            adaptation=adaptation.get('mode', 'none'),
+            sigma=adaptation.get('sigma', 0.5),
+            indpb=adaptation.get('indpb', 0.2),
+            sigma_min=adaptation.get('sigma_min', 0.01),
+            sigma_max=adaptation.get('sigma_max', 2.0),
+            diversity_control=adaptation.get('diversity_control', False),
+            target_diversity=adaptation.get('target_diversity', 0.3),
+            seed=config_data['evolution'].get('seed'),
+            run_index=config_data['evolution'].get('run_index', 0),
+            closed=track.get('closed', True),
+            entry_speed=track.get('entry_speed'),
+            exit_speed=track.get('exit_speed'),
+            robust=robust.get('enabled', False),
+            robust_samples=robust.get('samples', 32),
+            robust_statistic=robust.get('statistic', 'mean'),
+            robust_quantile=robust.get('quantile', 0.9),
+            robust_mu_std=robust.get('mu_std', 0.1),
+            robust_a_max_std=robust.get('a_max_std', 0.2),
+            robust_a_min_std=robust.get('a_min_std', 0.5)
         )
     
-    def FindBestLap(self, x_s: np.ndarray, y_s: np.ndarray) -> List[LapResult]:
+    def FindBestLap(self, x_s: np.ndarray, y_s: np.ndarray,
+                    seed_individuals: Optional[Sequence[Sequence[float]]] = None) -> List[LapResult]:
         """
         Find best lap using genetic algorithm
         
         Args:
             x_s: Track x coordinates (spline)
             y_s: Track y coordinates (spline)
+            seed_individuals: Optional genomes (e.g. from a previous run) that
+                replace the first random members of the initial population
             
         Returns:
             List of top 5 lap results from hall of fame
         """
+        self._init_streams()
+
         if self.config.show_progress:
             print(f"🏁 Starting Genetic Algorithm Optimization")
             print(f"   Population: {self.config.pop_size}")
             print(f"   Generations: {self.config.generations}")
             print(f"   Crossover: {self.config.crossover_prob}")
-            print(f"   Mutation: {self.config.mutation_prob}")
+            print(f"   Mutation: {self.config.mutation_prob} (sigma={self.config.sigma}, "
+                  f"indpb={self.config.indpb}, adaptation={self.config.adaptation})")
+            print(f"   Mode: {self.config.mode} ({self._worker_count()} workers)")
+            print(f"   Seed: {self.run_seed} (run {self.config.run_index})")
+            print(f"   Elitism: {self.config.elite_size} elites, reinject "
+                  f"{self.config.reinject_count} after {self.config.stagnation_generations} "
+                  f"stagnant generations")
+            if self.config.robust:
+                print(f"   Robust: {self.config.robust_statistic} over "
+                      f"{self.config.robust_samples} parameter samples")
             print("=" * 50)
         
-        # Initialize population
-        pop = toolbox.population(n=self.config.pop_size)
-        
-        # Setup hall of fame
-        hof = tools.HallOfFame(maxsize=self.config.hall_of_fame_size)
-        
-        # Evaluate initial population
-        for ind in pop:
-            ind.fitness.values = toolbox.evaluate(ind, x_s, y_s)
-            ind.generation = 0
+        multi_objective = self.config.objective_mode == "nsga2"
+        if multi_objective and self.config.mode != "generational":
+            raise ValueError("NSGA-II mode requires evolution.mode: generational")
+        if multi_objective and self.config.robust:
+            raise ValueError("Robust fitness is only available in single-objective mode")
 
-        # Evolution loop
-        for gen in range(1, self.config.generations + 1):
-            # Selection
-            offspring = toolbox.select(pop, len(pop))
-            offspring = list(map(toolbox.clone, offspring))
-            
-            # Crossover
-            for c1, c2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < self.config.crossover_prob:
-                    toolbox.mate(c1, c2)
-                    del c1.fitness.values
-                    del c2.fitness.values
-            
-            # Mutation
-            for mutant in offspring:
-                if random.random() < self.config.mutation_prob:
-                    toolbox.mutate(mutant)
-                    del mutant.fitness.values
-            
-            # Evaluate invalid individuals
-            invalid = [ind for ind in offspring if not ind.fitness.valid]
-            for ind in invalid:
-                ind.fitness.values = toolbox.evaluate(ind, x_s, y_s)
-            
-            # Replacement
-            pop[:] = offspring
-            
-            # Update generation
-            for ind in pop:
-                ind.generation = gen
-                
-            # Update hall of fame
-            hof.update(pop)
-            
-            # Statistics and logging
-            if self.config.show_statistics:
-                fits = [ind.fitness.values[0] for ind in pop]
-                best_fit = min(fits)
-                avg_fit = np.mean(fits)
-                print(f"Gen {gen:3d}: Best={best_fit:.2f}, Avg={avg_fit:.2f}")
+        # Setup hall of fame (Pareto front of non-dominated lines for NSGA-II)
+        if multi_objective:
+            hof = tools.ParetoFront()
+        else:
+            hof = tools.HallOfFame(maxsize=self.config.hall_of_fame_size)
+        self.history = []
+        self._seed_individuals = list(seed_individuals or [])
+
+        started = time.perf_counter()
+        with self._make_executor(x_s, y_s) as executor:
+            # Reference: the unmodified centerline (all offsets zero)
+            self.baseline = executor.submit(
+                _evaluate_genes, [0.0] * self.config.gene_count).result()[0]
+            if multi_objective:
+                self.evaluations = self._run_nsga2(executor, hof)
+            elif self.config.mode == "steady_state":
+                self.evaluations = self._run_steady_state(executor, hof)
+            elif self.config.mode == "generational":
+                self.evaluations = self._run_generational(executor, hof)
+            else:
+                raise ValueError(f"Unknown evolution mode: {self.config.mode}")
+        self.elapsed = time.perf_counter() - started
+        self.evals_per_sec = self.evaluations / max(self.elapsed, 1e-9)
 
         # Create results from hall of fame
         results = []
-        for rank, individual in enumerate(hof, 1):
+        for rank, individual in enumerate(sorted(hof, key=lambda ind: ind.fitness.values[0]), 1):
             lap_result = LapResult(
                 individual=list(individual),
                 lap_time=individual.fitness.values[0],
                 generation=getattr(individual, 'generation', 0),
-                rank=rank
+                rank=rank,
+                objectives=(dict(zip(self.config.objectives, individual.fitness.values))
+                            if multi_objective else None)
             )
             results.append(lap_result)
         
         # Show hall of fame if requested
         if self.config.show_hall_of_fame:
             print("\n" + "=" * 50)
-            print("🏆 HALL OF FAME - TOP 5 RESULTS")
+            if multi_objective:
+                print(f"🏆 PARETO FRONT - {len(results)} NON-DOMINATED LINES")
+            else:
+                print("🏆 HALL OF FAME - TOP 5 RESULTS")
             print("=" * 50)
             for result in results:
                 print(f"#{result.rank}: {result.lap_time:.3f}s (Gen {result.generation})")
+                if result.objectives:
+                    print("    " + ", ".join(f"{name}={value:.4g}"
+                                             for name, value in result.objectives.items()))
                 print(f"    Individual: {[f'{x:.2f}' for x in result.individual[:5]]}...")
                 print()
         
         if self.config.show_progress:
             print(f"✅ Optimization completed!")
             print(f"   Best lap time: {results[0].lap_time:.3f}s")
-            print(f"   Improvement: {(20.43 - results[0].lap_time):.3f}s")
+            print(f"   Improvement: {(self.baseline - results[0].lap_time):.3f}s "
+                  f"(centerline: {self.baseline:.3f}s)")
+            print(f"   Throughput: {self.evals_per_sec:.1f} evals/s "
+                  f"({self.evaluations} evaluations, {self._worker_count()} workers)")
         
         return results
 
+    def _init_streams(self):
+        """Create this run's random streams and the toolbox that uses them"""
+        # Without a configured seed every run draws fresh entropy; run_seed
+        # records the seed actually used so the run can be reproduced
+        self.run_seed = (self.config.seed if self.config.seed is not None
+                         else int(np.random.SeedSequence().entropy))
+        run_seq = np.random.SeedSequence(self.run_seed,
+                                         spawn_key=(self.config.run_index,))
+        ga_seq, robust_seq = run_seq.spawn(2)
+        self.rng = np.random.default_rng(ga_seq)
+        self.robust_rng = np.random.default_rng(robust_seq)
+        self.toolbox = make_toolbox(self.rng, tournsize=self.config.tournament_size,
+                                    sigma=self.config.sigma, indpb=self.config.indpb,
+                                    n_genes=self.config.gene_count)
+
+        # Adaptive operator state (constant unless adaptation is enabled)
+        self.sigma = self.config.sigma
+        self.crossover_prob = self.config.crossover_prob
+        self.mutation_prob = self.config.mutation_prob
+        self._initial_diversity = None
+
+        # Stagnation tracking and archive of distinct good lines for reinjection
+        self._archive = tools.HallOfFame(maxsize=self.config.reinject_archive_size)
+        self._best_so_far = None
+        self._stagnant = 0
+        self.reinjections = 0
+
+    def _worker_count(self) -> int:
+        """Number of evaluation processes (0 means one per CPU core)"""
+        return self.config.workers or os.cpu_count() or 1
+
+    def _make_executor(self, x_s: np.ndarray, y_s: np.ndarray):
+        """Create the evaluation pool, or an inline executor for a single worker"""
+        track_kwargs = dict(closed=self.config.closed,
+                            v_entry=self.config.entry_speed,
+                            v_exit=self.config.exit_speed,
+                            interpolation=self.config.interpolation)
+        if self.config.objective_mode == "nsga2":
+            evaluate_fn = partial(evaluate_multi, objectives=self.config.objectives,
+                                  **track_kwargs)
+        elif self.config.robust:
+            # One fixed sample set per run (common random numbers), so every
+            # individual is scored against the same conditions
+            samples = sample_vehicle_params(self.robust_rng,
+                                            self.config.robust_samples,
+                                            mu_std=self.config.robust_mu_std,
+                                            a_max_std=self.config.robust_a_max_std,
+                                            a_min_std=self.config.robust_a_min_std)
+            evaluate_fn = partial(evaluate_robust, samples=samples,
+                                  statistic=self.config.robust_statistic,
+                                  quantile=self.config.robust_quantile,
+                                  **track_kwargs)
+        else:
+            evaluate_fn = partial(self.toolbox.evaluate, **track_kwargs)
+        initargs = (evaluate_fn, x_s, y_s)
+        if self._worker_count() == 1:
+            return _InlineExecutor(_init_worker, initargs)
+        return ProcessPoolExecutor(max_workers=self._worker_count(),
+                                   initializer=_init_worker, initargs=initargs)
+
+    def _breed(self, pop: List) -> Any:
+        """Produce one changed child from two tournament-selected parents"""
+        c1, c2 = map(self.toolbox.clone, self.toolbox.select(pop, 2))
+        c1.parent_fitness = c1.fitness.values[0]
+        c1.mutated = False
+        if self.rng.random() < self.crossover_prob:
+            self.toolbox.mate(c1, c2)
+            del c1.fitness.values
+        if self.rng.random() < self.mutation_prob or c1.fitness.valid:
+            # An unchanged clone would only waste an evaluation slot
+            self._mutate(c1)
+            if c1.fitness.valid:
+                del c1.fitness.values
+        return c1
+
+    def _replace_by_tournament(self, pop: List, child: Any):
+        """Child replaces the worst of a random tournament if it is better"""
+        k = min(self.config.tournament_size, len(pop))
+        contenders = self.rng.choice(len(pop), k, replace=False)
+        worst = min(contenders, key=lambda i: pop[i].fitness)
+        if child.fitness > pop[worst].fitness:
+            pop[worst] = child
+
+    def _initial_population(self) -> List:
+        """Random initial population, with any seed genomes placed first"""
+        individual_cls = creator.Individual
+        if self.config.objective_mode == "nsga2":
+            individual_cls = multi_objective_types(len(self.config.objectives))
+        pop = [individual_cls(ind) for ind in self.toolbox.population(n=self.config.pop_size)]
+        for i, genes in enumerate(self._seed_individuals[:len(pop)]):
+            genes = np.clip(genes, self.config.gene_min, self.config.gene_max)
+            pop[i] = individual_cls(float(g) for g in genes)
+        for ind in pop:
+            ind.sigma = self.config.sigma
+        return pop
+
+    def _mutate(self, mutant: Any):
+        """
+        Gaussian mutation with the current step size. In self-adaptive mode
+        each individual carries its own sigma, perturbed log-normally first.
+        """
+        if self.config.adaptation == "self_adaptive":
+            tau = 1.0 / np.sqrt(len(mutant))
+            mutant.sigma = float(np.clip(mutant.sigma * np.exp(tau * self.rng.normal()),
+                                         self.config.sigma_min, self.config.sigma_max))
+            sigma = mutant.sigma
+        else:
+            sigma = self.sigma
+        self.toolbox.mutate(mutant, sigma=sigma)
+        mutant.mutated = True
+
+    def _vary(self, offspring: List):
+        """In-place crossover and mutation; changed individuals lose their fitness"""
+        for ind in offspring:
+            ind.parent_fitness = ind.fitness.values[0]
+            ind.mutated = False
+
+        # Crossover
+        for c1, c2 in zip(offspring[::2], offspring[1::2]):
+            if self.rng.random() < self.crossover_prob:
+                self.toolbox.mate(c1, c2)
+                del c1.fitness.values
+                del c2.fitness.values
+
+        # Mutation
+        for mutant in offspring:
+            if self.rng.random() < self.mutation_prob:
+                self._mutate(mutant)
+                del mutant.fitness.values
+
+    def _adapt(self, pop: List, children: List):
+        """
+        Update operator parameters after a generation (or pop_size
+        steady-state evaluations):
+          one_fifth: grow sigma when more than 1/5 of the mutated children
+                     beat their parent, shrink it otherwise (explore early,
+                     refine late)
+          diversity_control: when gene diversity falls below target_diversity
+                     (relative to the initial population), raise the mutation
+                     rate and lower the crossover rate proportionally
+        """
+        if self.config.adaptation == "self_adaptive":
+            # Report the population's typical step size
+            self.sigma = float(np.median([ind.sigma for ind in pop]))
+
+        mutated = [c for c in children if getattr(c, 'mutated', False)]
+        if self.config.adaptation == "one_fifth" and mutated:
+            success = np.mean([c.fitness.values[0] < c.parent_fitness for c in mutated])
+            if success > 0.2:
+                self.sigma /= 0.85
+            elif success < 0.2:
+                self.sigma *= 0.85
+            self.sigma = float(np.clip(self.sigma, self.config.sigma_min, self.config.sigma_max))
+
+        if self.config.diversity_control:
+            diversity = float(np.mean(np.std(np.asarray(pop, dtype=float), axis=0)))
+            if self._initial_diversity is None:
+                self._initial_diversity = max(diversity, 1e-12)
+            ratio = diversity / self._initial_diversity
+            scale = min(1.0, ratio / self.config.target_diversity)
+            self.crossover_prob = self.config.crossover_prob * scale
+            self.mutation_prob = min(1.0, self.config.mutation_prob / max(scale, 1e-3))
+
+    def _evaluate_invalid(self, executor, individuals: List) -> List:
+        """Evaluate individuals without a valid fitness; returns them"""
+        invalid = [ind for ind in individuals if not ind.fitness.valid]
+        fits = executor.map(_evaluate_genes, [list(ind) for ind in invalid],
+                            chunksize=max(1, len(invalid) // (4 * self._worker_count())))
+        for ind, fit in zip(invalid, fits):
+            ind.fitness.values = fit
+        return invalid
+
+    def _select_survivors(self, pop: List, offspring: List) -> List:
+        """
+        Elitism: the elite_size best parents survive unchanged (their cached
+        fitness is kept, so they are never re-evaluated) and replace the worst
+        offspring.
+        """
+        k = min(self.config.elite_size, len(pop))
+        if k <= 0:
+            return offspring
+        elites = list(map(self.toolbox.clone, tools.selBest(pop, k)))
+        return tools.selBest(offspring, len(offspring) - k) + elites
+
+    def _reinject_on_stagnation(self, pop: List, hof):
+        """
+        After stagnation_generations without a new best lap, replace surplus
+        copies of a line (then the worst members) with (already evaluated)
+        archived lines that are not in the population any more. With elitism the top lines never
+        leave the population, so copies of them would add no diversity; the
+        archive keeps reinject_archive_size distinct lines to draw from.
+        """
+        if not self.config.stagnation_generations or not len(hof):
+            return
+        self._archive.update(pop)
+        best = hof[0].fitness.values[0]
+        if self._best_so_far is None or best < self._best_so_far:
+            self._best_so_far = best
+            self._stagnant = 0
+            return
+        self._stagnant += 1
+        if self._stagnant < self.config.stagnation_generations:
+            return
+        self._stagnant = 0
+        present = {tuple(ind) for ind in pop}
+        absent = [member for member in self._archive if tuple(member) not in present]
+        # Replace surplus copies of a line first, then the worst lines
+        ranked = sorted(range(len(pop)), key=lambda i: pop[i].fitness, reverse=True)
+        seen, surplus, unique = set(), [], []
+        for i in ranked:
+            (surplus if tuple(pop[i]) in seen else unique).append(i)
+            seen.add(tuple(pop[i]))
+        worst = surplus[::-1] + unique[::-1]
+        for i, member in zip(worst, absent[:self.config.reinject_count]):
+            pop[i] = self.toolbox.clone(member)
+        self.reinjections += 1
+
+    def _log_generation(self, gen: int, pop: List, evaluations: int):
+        """Record best/average fitness of the current population"""
+        fits = [ind.fitness.values[0] for ind in pop]
+        best_fit = min(fits)
+        avg_fit = float(np.mean(fits))
+        self.history.append({'generation': gen, 'best': best_fit,
+                             'avg': avg_fit, 'evaluations': evaluations,
+                             'sigma': self.sigma, 'mutation_prob': self.mutation_prob,
+                             'crossover_prob': self.crossover_prob})
+        if self.config.show_statistics:
+            print(f"Gen {gen:3d}: Best={best_fit:.2f}, Avg={avg_fit:.2f}")
+
+    def _run_generational(self, executor, hof) -> int:
+        """Classic generational loop: every generation waits for all evaluations"""
+        # Initialize population
+        pop = self._initial_population()
+
+        # Evaluate initial population
+        self._evaluate_invalid(executor, pop)
+        for ind in pop:
+            ind.generation = 0
+        evaluations = len(pop)
+        hof.update(pop)
+        self._adapt(pop, [])
+        self._log_generation(0, pop, evaluations)
+
+        # Evolution loop
+        for gen in range(1, self.config.generations + 1):
+            # Selection
+            offspring = self.toolbox.select(pop, len(pop))
+            offspring = list(map(self.toolbox.clone, offspring))
+            
+            # Crossover and mutation
+            self._vary(offspring)
+            
+            # Evaluate invalid individuals
+            invalid = self._evaluate_invalid(executor, offspring)
+            evaluations += len(invalid)
+            
+            # Update generation
+            for ind in offspring:
+                ind.generation = gen
+
+            # Replacement (elites keep their generation and cached fitness)
+            pop[:] = self._select_survivors(pop, offspring)
+                
+            # Update hall of fame
+            hof.update(pop)
+            self._reinject_on_stagnation(pop, hof)
+
+            # Operator adaptation
+            self._adapt(pop, invalid)
+            
+            # Statistics and logging
+            self._log_generation(gen, pop, evaluations)
+
+        return evaluations
+
+    def _run_nsga2(self, executor, front) -> int:
+        """
+        NSGA-II loop (mu + lambda): parents and offspring are merged and the
+        next population is chosen by non-dominated rank and crowding distance.
+        """
+        pop = self._initial_population()
+        self._evaluate_invalid(executor, pop)
+        for ind in pop:
+            ind.generation = 0
+        evaluations = len(pop)
+
+        # Assigns the crowding distance used by selTournamentDCD
+        pop = tools.selNSGA2(pop, len(pop))
+        front.update(pop)
+        self._adapt(pop, [])
+        self._log_generation(0, pop, evaluations)
+
+        for gen in range(1, self.config.generations + 1):
+            offspring = sel_tournament_dcd(pop, len(pop), self.rng)
+            offspring = list(map(self.toolbox.clone, offspring))
+            self._vary(offspring)
+
+            invalid = self._evaluate_invalid(executor, offspring)
+            for ind in invalid:
+                ind.generation = gen
+            evaluations += len(invalid)
+
+            pop = tools.selNSGA2(pop + offspring, self.config.pop_size)
+            front.update(pop)
+            self._adapt(pop, invalid)
+            self._log_generation(gen, pop, evaluations)
+
+        return evaluations
+
+    def _run_steady_state(self, executor, hof) -> int:
+        """
+        Asynchronous steady-state loop.
+
+        A new child is submitted as soon as any worker finishes, so slow
+        evaluations never stall the others. Finished children enter a
+        fixed-size population through tournament replacement. The budget
+        matches the generational mode: pop_size * (generations + 1).
+        """
+        pop_size = self.config.pop_size
+        budget = pop_size * (self.config.generations + 1)
+        # Keep the queue a little deeper than the pool so workers never idle
+        in_flight = 2 * self._worker_count()
+
+        initial = self._initial_population()
+        pop = []
+        pending = {}
+        children = []
+        submitted = 0
+        evaluations = 0
+
+        def submit_next():
+            nonlocal submitted
+            if submitted < pop_size:
+                ind = initial[submitted]
+            else:
+                ind = self._breed(pop)
+            pending[executor.submit(_evaluate_genes, list(ind))] = ind
+            submitted += 1
+
+        def can_submit():
+            # Breeding needs a few evaluated parents to select from
+            return (submitted < budget and len(pending) < in_flight
+                    and (submitted < pop_size or len(pop) >= 2))
+
+        # Initial fill: only genomes of the initial population (pop is empty)
+        while submitted < min(in_flight, pop_size, budget):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            # Submission order (not set order) keeps single-worker runs reproducible
+            for future in [f for f in pending if f in done]:
+                ind = pending.pop(future)
+                ind.fitness.values = future.result()
+                ind.generation = evaluations // pop_size
+                evaluations += 1
+
+                if hasattr(ind, 'parent_fitness'):
+                    children.append(ind)
+                if len(pop) < pop_size:
+                    pop.append(ind)
+                else:
+                    self._replace_by_tournament(pop, ind)
+                hof.update([ind])
+
+                if evaluations % pop_size == 0:
+                    self._reinject_on_stagnation(pop, hof)
+                    self._adapt(pop, children)
+                    children = []
+                    self._log_generation(evaluations // pop_size - 1, pop, evaluations)
+
+                # Keep the queue topped up (also after a short initial fill)
+                while can_submit():
+                    submit_next()
+
+        return evaluations
+
 # Convenience function for direct usage
 def FindBestLap(x_s: np.ndarray, y_s: np.ndarray, 
                 config_path: str = "config/genetic_algorithm.yaml") -> List[LapResult]:
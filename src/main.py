@@ -1,8 +1,9 @@
 # src/main.py
 import argparse
 import os
-from dynamics import compute_lap_time
+from dynamics import compute_lap_profile
 from track_loader import list_tracks, load_waypoints, build_spline, plot_track
+from track_reporter import log_waypoints, write_report
 
 def main():
     parser = argparse.ArgumentParser(
@@ -14,6 +15,28 @@ def main():
         default=None,
         help="Filename of track CSV (e.g. ../track/waypoints_S.csv)"
     )
+    parser.add_argument(
+        "--report-dir",
+        type=str,
+        default=None,
+        help="Write waypoint/profile tables and summary.json to this directory"
+    )
+    parser.add_argument(
+        "--report-format",
+        choices=["csv", "json", "md"],
+        default="csv",
+        help="Table format for --report-dir"
+    )
+    parser.add_argument(
+        "--show-waypoints",
+        action="store_true",
+        help="Print a preview table of the loaded waypoints"
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Skip the matplotlib track plot (headless/batch use)"
+    )
     
     args = parser.parse_args()
 
@@ -28,9 +51,17 @@ def main():
 
     # Carrega e plota
     x, y = load_waypoints(track_path)
+    if args.show_waypoints:
+        log_waypoints(x, y)
     x_s, y_s = build_spline(x, y)
-    t0 = compute_lap_time(x_s, y_s)
-    plot_track(x, y, x_s, y_s, lap_time=t0)
+    profile = compute_lap_profile(x_s, y_s)
+    t0 = profile.lap_time
+    if args.report_dir:
+        write_report(args.report_dir, x, y, x_s, y_s, profile=profile,
+                     fmt=args.report_format)
+        print(f"Report written to: {args.report_dir}")
+    if not args.no_plot:
+        plot_track(x, y, x_s, y_s, lap_time=t0)
     print(f"Estimated lap time (s): {t0:.2f}")
 
 if __name__ == "__main__":
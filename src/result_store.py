@@ -0,0 +1,224 @@
+# src/result_store.py
+"""
+Persistent SQLite store for optimization runs.
+
+Every run is keyed by the track hash, spline resolution, vehicle parameters
+and GA configuration. The store keeps the hall of fame genomes, lap times
+(and NSGA-II objectives), run metadata and per-generation statistics, so
+results can be parsed back and new runs can warm-start from the best genomes
+of the same (or a similar) track.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from genetic_optimizer import LapResult
+
+SIGNATURE_POINTS = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_key         TEXT NOT NULL,
+    fitness_key     TEXT,
+    track_hash      TEXT NOT NULL,
+    track_signature TEXT NOT NULL,
+    num_points      INTEGER NOT NULL,
+    gene_count      INTEGER NOT NULL,
+    vehicle         TEXT NOT NULL,
+    config          TEXT NOT NULL,
+    created_at      TEXT NOT NULL,
+    best_lap_time   REAL,
+    evaluations     INTEGER,
+    elapsed         REAL
+);
+CREATE TABLE IF NOT EXISTS hall_of_fame (
+    run_id     INTEGER NOT NULL REFERENCES runs(id),
+    rank       INTEGER NOT NULL,
+    lap_time   REAL NOT NULL,
+    generation INTEGER NOT NULL,
+    genes      TEXT NOT NULL,
+    objectives TEXT
+);
+CREATE TABLE IF NOT EXISTS generation_stats (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    generation  INTEGER NOT NULL,
+    best        REAL NOT NULL,
+    avg         REAL NOT NULL,
+    evaluations INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_track ON runs(track_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_key ON runs(run_key);
+CREATE INDEX IF NOT EXISTS idx_runs_fitness ON runs(track_hash, fitness_key);
+CREATE INDEX IF NOT EXISTS idx_hof_run ON hall_of_fame(run_id);
+"""
+
+def track_signature(x_s: np.ndarray, y_s: np.ndarray,
+                    n: int = SIGNATURE_POINTS) -> np.ndarray:
+    """Centred, resampled copy of the spline used to find similar tracks."""
+    idx = np.linspace(0, len(x_s) - 1, n).round().astype(int)
+    sig = np.column_stack([x_s[idx], y_s[idx]])
+    return sig - sig.mean(axis=0)
+
+def run_key(track_hash: str, num_points: int,
+            vehicle: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """Hash identifying runs with identical track, spline, vehicle and config."""
+    payload = json.dumps([track_hash, num_points, vehicle, config], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+# GAConfig fields that change what a stored lap time means: only runs that
+# agree on these (and on the vehicle) have comparable hall-of-fame fitness
+FITNESS_FIELDS = ("closed", "entry_speed", "exit_speed", "objective_mode", "robust",
+                  "interpolation")
+OBJECTIVE_FIELDS = ("objectives",)
+ROBUST_FIELDS = ("robust_samples", "robust_statistic", "robust_quantile",
+                 "robust_mu_std", "robust_a_max_std", "robust_a_min_std")
+
+def fitness_key(vehicle: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """
+    Hash of the settings that define fitness (vehicle, track topology,
+    gene encoding, objective, robust sampling). Unlike run_key it ignores
+    seed, population size and other search settings, so it selects
+    warm-start candidates.
+    """
+    fields = FITNESS_FIELDS
+    if config.get("objective_mode", "single") != "single":
+        fields += OBJECTIVE_FIELDS
+    if config.get("robust"):
+        fields += ROBUST_FIELDS
+    payload = json.dumps([vehicle, {k: config.get(k) for k in fields}], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+class ResultStore:
+    """SQLite-backed archive of optimization runs."""
+
+    def __init__(self, path: str = "outputs/results.sqlite"):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(runs)")]
+        if columns and "fitness_key" not in columns:
+            # Stores created before fitness_key existed: old runs get NULL
+            # and are never used for warm-starting
+            self.conn.execute("ALTER TABLE runs ADD COLUMN fitness_key TEXT")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(hall_of_fame)")]
+        if columns and "objectives" not in columns:
+            # Stores created before NSGA-II objectives were kept: old rows get NULL
+            self.conn.execute("ALTER TABLE hall_of_fame ADD COLUMN objectives TEXT")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def save_run(self, track_hash: str, x_s: np.ndarray, y_s: np.ndarray,
+                 vehicle: Dict[str, Any], config: Dict[str, Any],
+                 results: List[LapResult], history: List[Dict[str, Any]],
+                 evaluations: Optional[int] = None,
+                 elapsed: Optional[float] = None) -> int:
+        """Store one run (hall of fame + generation stats). Returns its id."""
+        signature = track_signature(x_s, y_s)
+        gene_count = len(results[0].individual) if results else 0
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (run_key, fitness_key, track_hash, track_signature,"
+                " num_points, gene_count, vehicle, config, created_at, best_lap_time,"
+                " evaluations, elapsed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_key(track_hash, len(x_s), vehicle, config),
+                 fitness_key(vehicle, config), track_hash,
+                 json.dumps(signature.tolist()), len(x_s), gene_count,
+                 json.dumps(vehicle, sort_keys=True), json.dumps(config, sort_keys=True),
+                 datetime.now().isoformat(timespec='seconds'),
+                 results[0].lap_time if results else None, evaluations, elapsed))
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO hall_of_fame (run_id, rank, lap_time, generation, genes,"
+                " objectives) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, r.rank, float(r.lap_time), r.generation,
+                  json.dumps([float(g) for g in r.individual]),
+                  json.dumps({k: float(v) for k, v in r.objectives.items()})
+                  if r.objectives else None) for r in results])
+            self.conn.executemany(
+                "INSERT INTO generation_stats (run_id, generation, best, avg, evaluations)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(run_id, h['generation'], float(h['best']), float(h['avg']),
+                  h['evaluations']) for h in history])
+        return run_id
+
+    def load_results(self, run_id: int) -> List[LapResult]:
+        """Parse a stored hall of fame back into LapResult objects."""
+        rows = self.conn.execute(
+            "SELECT genes, lap_time, generation, rank, objectives FROM hall_of_fame"
+            " WHERE run_id = ? ORDER BY rank", (run_id,))
+        return [LapResult(individual=json.loads(genes), lap_time=lap_time,
+                          generation=generation, rank=rank,
+                          objectives=json.loads(objectives) if objectives else None)
+                for genes, lap_time, generation, rank, objectives in rows]
+
+    def load_history(self, run_id: int) -> List[Dict[str, Any]]:
+        """Per-generation statistics of a stored run."""
+        rows = self.conn.execute(
+            "SELECT generation, best, avg, evaluations FROM generation_stats"
+            " WHERE run_id = ? ORDER BY generation", (run_id,))
+        return [dict(generation=g, best=b, avg=a, evaluations=e) for g, b, a, e in rows]
+
+    def similar_tracks(self, x_s: np.ndarray, y_s: np.ndarray,
+                       max_distance: float = 0.05) -> List[str]:
+        """
+        Track hashes whose shape is close to the given spline, closest first.
+        Distance is the RMS gap between signatures relative to track size.
+        """
+        signature = track_signature(x_s, y_s)
+        scale = np.ptp(signature, axis=0).max() + 1e-8
+        matches = []
+        rows = self.conn.execute("SELECT DISTINCT track_hash, track_signature FROM runs")
+        for hash_, sig_json in rows:
+            other = np.asarray(json.loads(sig_json))
+            if other.shape != signature.shape:
+                continue
+            dist = np.sqrt(np.mean(np.sum((other - signature)**2, axis=1))) / scale
+            if dist <= max_distance:
+                matches.append((dist, hash_))
+        return [hash_ for _, hash_ in sorted(matches)]
+
+    def best_genomes(self, track_hash: str, x_s: np.ndarray, y_s: np.ndarray,
+                     gene_count: int, limit: int = 10,
+                     fitness: Optional[str] = None) -> List[List[float]]:
+        """
+        Best stored genomes for warm-starting: exact track first, then
+        similar tracks. Duplicates are dropped.
+
+        fitness: a fitness_key; only runs scored the same way (open/closed,
+        entry/exit speeds, robust, objective mode, vehicle) are ranked
+        against each other. None ranks every run of the track.
+        """
+        hashes = [track_hash] + [h for h in self.similar_tracks(x_s, y_s) if h != track_hash]
+        genomes, seen = [], set()
+        for hash_ in hashes:
+            query = ("SELECT h.genes FROM hall_of_fame h JOIN runs r ON r.id = h.run_id"
+                     " WHERE r.track_hash = ? AND r.gene_count = ?")
+            params = [hash_, gene_count]
+            if fitness is not None:
+                query += " AND r.fitness_key = ?"
+                params.append(fitness)
+            rows = self.conn.execute(query + " ORDER BY h.lap_time", params)
+            for (genes,) in rows:
+                if genes not in seen:
+                    seen.add(genes)
+                    genomes.append(json.loads(genes))
+                if len(genomes) >= limit:
+                    return genomes
+        return genomes
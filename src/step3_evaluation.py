@@ -1,32 +1,97 @@
 # step3_evaluation.py
 
 import numpy as np
-from dynamics import compute_lap_time
+from scipy.interpolate import CubicSpline
+from dynamics import (
+    compute_lap_time, compute_lap_profile, compute_lap_times_batch,
+    line_objectives, LINE_OBJECTIVES
+)
 
-def evaluate(individual, x_s, y_s):
+def centerline_normals(x_s, y_s):
+    """Normais unitárias (à esquerda) da centerline em cada ponto da spline."""
+    dx = np.gradient(x_s)
+    dy = np.gradient(y_s)
+    norms = np.hypot(dx, dy)
+    return -dy / norms, dx / norms
+
+# Interpolação dos genes ao longo da centerline:
+#   "linear": offsets lineares por partes entre genes (codificação original)
+#   "cubic":  spline cúbica (periódica em pista fechada), sem quinas nos genes
+GENE_INTERPOLATIONS = ("linear", "cubic")
+
+def gene_knots(gene_count, closed=True, interpolation="linear"):
+    """Parâmetro u em [0, 1] de cada gene ao longo da centerline."""
+    if interpolation == "cubic" and closed:
+        # Periódica: u = 1 coincide com o gene 0, os genes ficam distintos
+        return np.linspace(0, 1, gene_count + 1)[:-1]
+    return np.linspace(0, 1, gene_count)
+
+def gene_offsets(individual, n_points, closed=True, interpolation="linear"):
+    """Offset lateral em cada um dos n_points da spline a partir dos genes."""
+    if interpolation not in GENE_INTERPOLATIONS:
+        raise ValueError(f"Unknown gene interpolation: {interpolation}")
+    u = np.linspace(0, 1, n_points)
+    knots = gene_knots(len(individual), closed, interpolation)
+    if interpolation == "linear":
+        return np.interp(u, knots, individual)
+    if closed:
+        return CubicSpline(np.append(knots, 1.0), np.append(individual, individual[0]),
+                           bc_type="periodic")(u)
+    return CubicSpline(knots, individual)(u)
+
+def offset_trajectory(individual, x_s, y_s, closed=True, interpolation="linear"):
     """
-    1) Recebe individual de tamanho 10
-    2) Interpola para 100 pontos
-    3) Desenha nova trajectória e chama compute_lap_time
+    Desloca a centerline (x_s, y_s) lateralmente segundo os genes do
+    indivíduo e devolve a nova trajetória (x_traj, y_traj).
     """
-    # 1) Cria parâmetro u para 10 e para 100
-    u10 = np.linspace(0, 1, len(individual))
-    u100 = np.linspace(0, 1, len(x_s))
-
-    # 2) Interpola offsets para cada ponto spline
-    offsets = np.interp(u100, u10, individual)
+    # 1-2) Interpola offsets dos genes para cada ponto spline
+    offsets = gene_offsets(individual, len(x_s), closed, interpolation)
 
     # 3) Calcula normais à centerline
-    dx = np.gradient(x_s)
-    dy = np.gradient(y_s)
-    norms = np.hypot(dx, dy)
-    nx = -dy / norms
-    ny =  dx / norms
+    nx, ny = centerline_normals(x_s, y_s)
 
     # 4) Desloca centerline
     x_traj = x_s + offsets * nx
     y_traj = y_s + offsets * ny
+    return x_traj, y_traj
+
+def evaluate(individual, x_s, y_s, closed=True, v_entry=None, v_exit=None,
+             interpolation="linear"):
+    """
+    1) Recebe individual de tamanho 10
+    2) Interpola para 100 pontos
+    3) Desenha nova trajectória e chama compute_lap_time
+    (closed=False: pista aberta com velocidades de entrada/saída opcionais)
+    """
+    x_traj, y_traj = offset_trajectory(individual, x_s, y_s, closed, interpolation)
 
     # 5) Calcula tempo de volta
-    t = compute_lap_time(x_traj, y_traj)
+    t = compute_lap_time(x_traj, y_traj, closed=closed, v_entry=v_entry, v_exit=v_exit)
     return (t,)
+
+def evaluate_multi(individual, x_s, y_s, objectives=LINE_OBJECTIVES,
+                   closed=True, v_entry=None, v_exit=None, interpolation="linear"):
+    """
+    Versão multiobjetivo: uma única simulação (LapProfile) fornece o tempo
+    de volta e as métricas secundárias pedidas em `objectives`.
+    """
+    x_traj, y_traj = offset_trajectory(individual, x_s, y_s, closed, interpolation)
+    profile = compute_lap_profile(x_traj, y_traj, closed=closed,
+                                  v_entry=v_entry, v_exit=v_exit)
+    metrics = line_objectives(profile)
+    return tuple(metrics[name] for name in objectives)
+
+def evaluate_robust(individual, x_s, y_s, samples, statistic="mean", quantile=0.9,
+                    closed=True, v_entry=None, v_exit=None, interpolation="linear"):
+    """
+    Versão robusta: avalia a trajetória para todas as amostras de parâmetros
+    (mu, a_max, a_min) numa única chamada vetorizada e devolve a média ou um
+    quantil dos tempos de volta.
+    """
+    x_traj, y_traj = offset_trajectory(individual, x_s, y_s, closed, interpolation)
+    times = compute_lap_times_batch(x_traj, y_traj, samples["mu"],
+                                    samples["a_max"], samples["a_min"],
+                                    closed=closed, v_entry=v_entry, v_exit=v_exit)
+    if statistic == "quantile":
+        return (float(np.quantile(times, quantile)),)
+    return (float(np.mean(times)),)
@@ -7,3 +7,13 @@ creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
 
 # 2) Tipo de indivíduo: herda de list e carrega um fitness
 creator.create("Individual", list, fitness=creator.FitnessMin)
+
+# 3) Tipos multiobjetivo (NSGA-II): um par Fitness/Individual por número de objetivos
+def multi_objective_types(n_objectives):
+    """Cria (uma vez) e devolve a classe Individual com n objetivos minimizados."""
+    fitness_name = f"FitnessMulti{n_objectives}"
+    individual_name = f"IndividualMulti{n_objectives}"
+    if not hasattr(creator, fitness_name):
+        creator.create(fitness_name, base.Fitness, weights=(-1.0,) * n_objectives)
+        creator.create(individual_name, list, fitness=getattr(creator, fitness_name))
+    return getattr(creator, individual_name)
@@ -1,25 +1,75 @@
 # step5_toolbox.py
 
-import random
+import numpy as np
 from deap import tools
 from deap import base
 from step4_setup_deap import creator
 from step3_evaluation import evaluate
 
-toolbox = base.Toolbox()
+# Operadores equivalentes aos do DEAP (selTournament, cxTwoPoint, mutGaussian),
+# mas usando um numpy.random.Generator explícito em vez do módulo global
+# `random`, para que cada execução seja reproduzível a partir de uma seed.
 
-# 1) Atributo = offset inicial aleatório em [-2,2] metros
-toolbox.register("attr_offset", random.uniform, -2.0, 2.0)
+def init_individual(icls, rng, n, low=-2.0, high=2.0):
+    """Indivíduo com n offsets laterais uniformes em [low, high] metros."""
+    return icls(rng.uniform(low, high, n).tolist())
 
-# 2) Indivíduo = repeate attr_offset N times
-toolbox.register("individual", tools.initRepeat,
-                 creator.Individual, toolbox.attr_offset, n=10)
+def sel_tournament(individuals, k, tournsize, rng):
+    """Seleção por torneio: k vencedores de torneios de tamanho tournsize."""
+    aspirants = rng.integers(0, len(individuals), size=(k, tournsize))
+    return [max((individuals[i] for i in row), key=lambda ind: ind.fitness)
+            for row in aspirants]
 
-# 3) População
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+def sel_tournament_dcd(individuals, k, rng):
+    """
+    Torneio binário do NSGA-II: vence quem domina; senão, a maior crowding
+    distance (atribuída por tools.selNSGA2).
+    """
+    def duel(a, b):
+        if a.fitness.dominates(b.fitness):
+            return a
+        if b.fitness.dominates(a.fitness):
+            return b
+        if a.fitness.crowding_dist != b.fitness.crowding_dist:
+            return a if a.fitness.crowding_dist > b.fitness.crowding_dist else b
+        return a if rng.random() < 0.5 else b
 
-# 4) Operadores básicos
-toolbox.register("evaluate", evaluate)
-toolbox.register("select", tools.selTournament, tournsize=3)
-toolbox.register("mate", tools.cxTwoPoint)
-toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.5, indpb=0.2)
+    pairs = rng.integers(0, len(individuals), size=(k, 2))
+    return [duel(individuals[i], individuals[j]) for i, j in pairs]
+
+def cx_two_point(ind1, ind2, rng):
+    """Crossover de dois pontos (troca o segmento entre os pontos de corte)."""
+    size = min(len(ind1), len(ind2))
+    if size < 2:
+        return ind1, ind2
+    cx1, cx2 = np.sort(rng.choice(np.arange(1, size + 1), 2, replace=False))
+    ind1[cx1:cx2], ind2[cx1:cx2] = ind2[cx1:cx2], ind1[cx1:cx2]
+    return ind1, ind2
+
+def mut_gaussian(individual, mu, sigma, indpb, rng):
+    """Mutação gaussiana: cada gene recebe N(mu, sigma) com probabilidade indpb."""
+    mask = rng.random(len(individual)) < indpb
+    for i in np.flatnonzero(mask):
+        individual[i] += rng.normal(mu, sigma)
+    return (individual,)
+
+def make_toolbox(rng=None, tournsize=3, sigma=0.5, indpb=0.2, n_genes=10):
+    """Toolbox cujos operadores estocásticos usam o Generator `rng`."""
+    rng = rng if rng is not None else np.random.default_rng()
+    toolbox = base.Toolbox()
+
+    # 1) Indivíduo = N offsets iniciais aleatórios em [-2,2] metros
+    toolbox.register("individual", init_individual, creator.Individual, rng, n_genes)
+
+    # 2) População
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+
+    # 3) Operadores básicos
+    toolbox.register("evaluate", evaluate)
+    toolbox.register("select", sel_tournament, tournsize=tournsize, rng=rng)
+    toolbox.register("mate", cx_two_point, rng=rng)
+    toolbox.register("mutate", mut_gaussian, mu=0, sigma=sigma, indpb=indpb, rng=rng)
+    return toolbox
+
+# Toolbox padrão (seed aleatória) usada pelos scripts step6/step7
+toolbox = make_toolbox()
@@ -0,0 +1,225 @@
+# src/telemetry.py
+"""
+Real-time comparison of a recorded lap against the simulated optimal one.
+
+Each GPS sample is map-matched onto the reference line with a KD-tree over
+the spline nodes (a handful of candidate nodes per sample instead of a scan
+over the whole line), projected onto the neighbouring segments and converted
+to the reference time at that point of the lap. The running time delta is
+available after every sample, so a recorded lap can be streamed at pit-wall
+speed (or replayed in real time).
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+@dataclass
+class TelemetryPoint:
+    """
+    One map-matched telemetry sample.
+
+    segment/fraction locate the sample on the reference line (between node
+    segment and the next one), offset is the signed lateral distance (left
+    positive), delta is rider elapsed time minus reference time (positive =
+    slower than the reference).
+    """
+    t: float
+    x: float
+    y: float
+    segment: int
+    fraction: float
+    s: float
+    offset: float
+    t_ref: float
+    delta: float
+    v_ref: float
+    v: Optional[float] = None
+    lap: int = 0
+
+def load_telemetry(path):
+    """Load a recorded lap from CSV (header: t,x,y[,v]; t in s, v in m/s)."""
+    data = np.genfromtxt(path, delimiter=",", names=True)
+    v = data["v"] if "v" in data.dtype.names else None
+    return data["t"], data["x"], data["y"], v
+
+class TelemetryComparator:
+    """
+    Streaming map-matcher and time-delta calculator against a reference lap.
+
+    Args:
+        x_s, y_s: reference line nodes (e.g. from build_spline)
+        v_ref: reference speed per node (m/s)
+        t_cum: reference time at each node (LapProfile.t_cum)
+        dt: reference time per segment (LapProfile.dt); derived from t_cum if None
+        closed: closed circuit (lap counting across the start/finish node)
+        k: candidate nodes returned by the KD-tree per sample
+        window: max node jump between consecutive samples before the match is
+                treated as a relocation (default: a tenth of the line)
+    """
+
+    def __init__(self, x_s, y_s, v_ref, t_cum, dt=None, closed=True, k=8, window=None):
+        self.points = np.column_stack([x_s, y_s]).astype(float)
+        self.v_ref = np.asarray(v_ref, dtype=float)
+        self.t_cum = np.asarray(t_cum, dtype=float)
+        if dt is None:
+            dt = np.append(np.diff(self.t_cum), 0.0)
+        self.dt = np.asarray(dt, dtype=float)
+        self.closed = closed
+        self.n = len(self.points)
+        self.k = min(k, self.n)
+        self.window = window if window is not None else max(self.n // 10, 1)
+
+        self.tree = cKDTree(self.points)
+        nxt = np.roll(self.points, -1, axis=0)
+        self.seg_vec = nxt - self.points
+        self.seg_len2 = np.sum(self.seg_vec**2, axis=1)
+        if not closed:
+            self.seg_len2[-1] = 0.0
+        ds = np.sqrt(self.seg_len2)
+        self.s_cum = np.concatenate([[0.0], np.cumsum(ds)[:-1]])
+        self.length = float(np.sum(ds))
+        self.lap_time = float(np.sum(self.dt))
+        self.reset()
+
+    @classmethod
+    def from_profile(cls, x_s, y_s, profile, **kwargs):
+        """Build a comparator from a dynamics.LapProfile of the reference line."""
+        return cls(x_s, y_s, profile.v, profile.t_cum, profile.dt, **kwargs)
+
+    def reset(self):
+        """Forget the current lap (next sample starts a new comparison)."""
+        self._prev_segment = None
+        self._prev_s = None
+        self._progress = None
+        self._t0 = None
+        self._t_ref0 = None
+        self._lap = 0
+
+    def _candidate_segments(self, p):
+        """Segments touching the k nodes nearest to p, restricted to the
+        continuity window around the previous match when possible."""
+        _, nodes = self.tree.query(p, k=self.k)
+        nodes = np.atleast_1d(nodes)
+        segs = np.unique(np.concatenate([nodes - 1, nodes]))
+        segs = segs % self.n if self.closed else segs[(segs >= 0) & (segs < self.n - 1)]
+        if self._prev_segment is None or len(segs) == 0:
+            return segs
+        jump = segs - self._prev_segment
+        if self.closed:
+            jump = (jump + self.n // 2) % self.n - self.n // 2
+        near = segs[np.abs(jump) <= self.window]
+        return near if len(near) else segs
+
+    def match(self, x, y):
+        """Project (x, y) onto the reference line: (segment, fraction, signed offset)."""
+        p = np.array([x, y], dtype=float)
+        segs = self._candidate_segments(p)
+        if len(segs) == 0:
+            segs = np.array([0])
+        a = self.points[segs]
+        d = self.seg_vec[segs]
+        len2 = self.seg_len2[segs]
+        rel = p - a
+        frac = np.where(len2 > 0, np.sum(rel * d, axis=1) / np.maximum(len2, 1e-12), 0.0)
+        frac = np.clip(frac, 0.0, 1.0)
+        gap = rel - frac[:, None] * d
+        best = int(np.argmin(np.sum(gap**2, axis=1)))
+
+        cross = d[best, 0] * rel[best, 1] - d[best, 1] * rel[best, 0]
+        dist = float(np.hypot(*gap[best]))
+        offset = float(np.sign(cross)) * dist if cross != 0 else dist
+        return int(segs[best]), float(frac[best]), offset
+
+    def update(self, t, x, y, v=None) -> TelemetryPoint:
+        """Map-match one sample and return its time delta to the reference."""
+        seg, frac, offset = self.match(x, y)
+        nxt = (seg + 1) % self.n
+        s = self.s_cum[seg] + frac * np.sqrt(self.seg_len2[seg])
+        t_ref = self.t_cum[seg] + frac * self.dt[seg]
+        v_ref = (1 - frac) * self.v_ref[seg] + frac * self.v_ref[nxt]
+
+        if self._t0 is None:
+            self._t0, self._t_ref0 = t, t_ref
+            self._progress = s
+        else:
+            # Unwrapped progress: a step across the start/finish node counts
+            # as a short move, so GPS jitter back and forth over the line
+            # adds and removes the lap instead of accumulating laps
+            step = s - self._prev_s
+            if self.closed:
+                step = (step + self.length / 2) % self.length - self.length / 2
+            self._progress += step
+        if self.closed:
+            self._lap = int(round((self._progress - s) / self.length))
+        self._prev_segment, self._prev_s = seg, s
+
+        elapsed_ref = t_ref + self._lap * self.lap_time - self._t_ref0
+        delta = (t - self._t0) - elapsed_ref
+        return TelemetryPoint(t=float(t), x=float(x), y=float(y), segment=seg,
+                              fraction=frac, s=float(s), offset=offset,
+                              t_ref=float(t_ref), delta=float(delta),
+                              v_ref=float(v_ref),
+                              v=None if v is None else float(v), lap=self._lap)
+
+    def stream(self, samples: Iterable, realtime: bool = False) -> Iterator[TelemetryPoint]:
+        """
+        Map-match a sequence of (t, x, y[, v]) samples, yielding each result
+        as soon as it is computed. realtime=True paces the replay by the
+        sample timestamps (recorded lap played back live).
+        """
+        wall0 = t_first = None
+        for sample in samples:
+            t = sample[0]
+            if realtime:
+                if wall0 is None:
+                    wall0, t_first = time.perf_counter(), t
+                wait = (t - t_first) - (time.perf_counter() - wall0)
+                if wait > 0:
+                    time.sleep(wait)
+            yield self.update(*sample)
+
+def compare_lap(comparator: TelemetryComparator, t, x, y, v=None) -> dict:
+    """Compare a whole recorded lap; returns per-sample arrays."""
+    comparator.reset()
+    v = [None] * len(t) if v is None else v
+    points = list(comparator.stream(zip(t, x, y, v)))
+    return {name: np.array([getattr(p, name) for p in points], dtype=float)
+            for name in ("t", "s", "offset", "t_ref", "delta", "v_ref")}
+
+if __name__ == "__main__":
+    import argparse
+    from track_loader import load_waypoints, build_spline
+    from dynamics import compute_lap_profile
+
+    parser = argparse.ArgumentParser(description="Compare a recorded lap against the simulated reference")
+    parser.add_argument("telemetry", help="CSV with columns t,x,y[,v]")
+    parser.add_argument("--track", "-t", default="tracks/waypoints_S.csv")
+    parser.add_argument("--points", "-p", type=int, default=2000)
+    parser.add_argument("--reference", default=None,
+                        help="CSV (x,y) of the reference line (default: track centerline)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Replay the samples at their recorded rate")
+    parser.add_argument("--every", type=int, default=10, help="Print every n-th sample")
+    args = parser.parse_args()
+
+    if args.reference:
+        x_s, y_s = load_waypoints(args.reference)
+    else:
+        x_s, y_s = build_spline(*load_waypoints(args.track), num_points=args.points)
+    comparator = TelemetryComparator.from_profile(x_s, y_s, compute_lap_profile(x_s, y_s))
+
+    t, x, y, v = load_telemetry(args.telemetry)
+    samples = zip(t, x, y, v) if v is not None else zip(t, x, y)
+    start = time.perf_counter()
+    for i, point in enumerate(comparator.stream(samples, realtime=args.realtime)):
+        if i % args.every == 0:
+            speed = f" | v {point.v*3.6:5.1f} km/h" if point.v is not None else ""
+            print(f"⏱️  t {point.t:7.2f}s | s {point.s:7.1f} m | Δ {point.delta:+6.2f}s"
+                  f" | off {point.offset:+5.2f} m | v_ref {point.v_ref*3.6:5.1f} km/h{speed}")
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(t)} samples matched in {elapsed:.3f}s "
+          f"({elapsed / max(len(t), 1) * 1e6:.0f} µs/sample), final Δ {point.delta:+.2f}s")
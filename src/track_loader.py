@@ -1,5 +1,6 @@
 # src/track_loader.py
 import os
+import hashlib
 import numpy as np
 from scipy.interpolate import splprep, splev
 import matplotlib.pyplot as plt
@@ -13,12 +14,56 @@ def load_waypoints(path):
     data = np.loadtxt(path, delimiter=",", skiprows=1)
     return data[:,0], data[:,1]
 
-def build_spline(x, y, num_points=500):
-    tck, _ = splprep([x, y], s=0, per=True)
+def track_hash(x, y):
+    """Short content hash of a track's waypoints (stable across file names)."""
+    data = np.ascontiguousarray(np.column_stack([x, y]), dtype=np.float64)
+    return hashlib.sha256(data.tobytes()).hexdigest()[:16]
+
+# Fitted splines per (track hash, closed): splprep runs once per track,
+# evaluating at any resolution afterwards is just splev.
+SPLINE_CACHE_DIR = os.path.join("outputs", "cache")
+_SPLINE_CACHE = {}
+
+def _spline_cache_path(cache_dir, key):
+    track, closed = key
+    return os.path.join(cache_dir, f"spline_{track}_{'closed' if closed else 'open'}.npz")
+
+def fit_spline(x, y, closed=True, cache_dir=SPLINE_CACHE_DIR):
+    """
+    Fitted (t, c, k) spline of the waypoints, cached in memory and in
+    cache_dir (None disables the on-disk cache).
+    """
+    key = (track_hash(x, y), bool(closed))
+    tck = _SPLINE_CACHE.get(key)
+    if tck is not None:
+        return tck
+
+    path = _spline_cache_path(cache_dir, key) if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            tck = (data["t"], [data["cx"], data["cy"]], int(data["k"]))
+    else:
+        tck, _ = splprep([x, y], s=0, per=closed)
+        if path:
+            # Write to a temp file first so concurrent jobs never read a partial cache
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+            np.savez(tmp, t=tck[0], cx=tck[1][0], cy=tck[1][1], k=tck[2])
+            os.replace(tmp, path)
+
+    _SPLINE_CACHE[key] = tck
+    return tck
+
+def evaluate_spline(tck, num_points=500):
+    """Sample a fitted spline at num_points evenly spaced parameter values."""
     u = np.linspace(0, 1, num_points)
     x_s, y_s = splev(u, tck)
     return x_s, y_s
 
+def build_spline(x, y, num_points=500, closed=True, cache_dir=SPLINE_CACHE_DIR):
+    """Interpolating spline through the waypoints; periodic for closed tracks."""
+    return evaluate_spline(fit_spline(x, y, closed, cache_dir), num_points)
+
 def plot_track(x, y, x_s, y_s, lap_time=None):
     """Plot the original waypoints and the smoothed spline track."""
     plt.figure(figsize=(10, 8))
@@ -1,47 +1,159 @@
+import io
+import json
+import os
+import sys
+
 import numpy as np
 
-def log_waypoints(x, y, title="ORIGINAL WAYPOINTS", logger=None):
-    """Log all waypoints to terminal in a formatted table."""
+def _emit(lines, quiet=False):
+    """Write a block of report lines to stdout in a single call."""
+    if not quiet:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def _preview_rows(n, max_rows):
+    """Row indices shown in a truncated preview (head and tail) and the omitted count."""
+    if max_rows is None or n <= max_rows:
+        return np.arange(n), 0
+    head = max_rows - max_rows // 2
+    tail = max_rows // 2
+    return np.concatenate([np.arange(head), np.arange(n - tail, n)]), n - max_rows
+
+def write_table(path, columns, fmt=None, float_format="%.6f"):
+    """
+    Write named columns to CSV, JSON or Markdown in bulk.
+
+    Args:
+        path: output file; format is taken from the extension unless fmt is given
+        columns: dict of column name -> 1D array (all the same length)
+        fmt: 'csv', 'json' or 'md'
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    names = list(columns)
+    data = np.column_stack([np.asarray(columns[name], dtype=float) for name in names])
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if fmt == "csv":
+        np.savetxt(path, data, delimiter=",", fmt=float_format,
+                   header=",".join(names), comments="")
+    elif fmt == "json":
+        with open(path, "w") as f:
+            json.dump({name: data[:, i].tolist() for i, name in enumerate(names)}, f)
+    elif fmt == "md":
+        header = "| " + " | ".join(names) + " |\n|" + "---|" * len(names)
+        row_fmt = "| " + " | ".join([float_format] * len(names)) + " |"
+        np.savetxt(path, data, fmt=row_fmt, header=header, comments="")
+    else:
+        raise ValueError(f"Unsupported table format: {fmt}")
+
+def summarize_track(x, y, x_s, y_s, v_profile=None, t_cum=None, kappa=None):
+    """Vectorized summary statistics of a track and (optionally) its lap simulation."""
+    track_length = float(np.sum(np.hypot(np.diff(x_s), np.diff(y_s))))
+    summary = {
+        "waypoints": int(len(x)),
+        "spline_points": int(len(x_s)),
+        "track_length_m": track_length,
+    }
+    if v_profile is not None:
+        summary.update({
+            "max_speed_kmh": float(np.max(v_profile) * 3.6),
+            "min_speed_kmh": float(np.min(v_profile) * 3.6),
+            "avg_speed_kmh": float(np.mean(v_profile) * 3.6),
+        })
+    if t_cum is not None:
+        summary["lap_time_s"] = float(t_cum[-1])
+        summary["avg_lap_speed_kmh"] = track_length / float(t_cum[-1]) * 3.6
+    if kappa is not None:
+        max_kappa = float(np.max(np.abs(kappa)))
+        summary["max_curvature"] = max_kappa
+        summary["min_turn_radius_m"] = 1 / (max_kappa + 1e-8)
+    return summary
+
+def write_report(out_dir, x, y, x_s, y_s, v_profile=None, t_cum=None, kappa=None,
+                 fmt="csv", logger=None, profile=None, n_sectors=3):
+    """
+    Write the full track report to out_dir: waypoints and spline/profile
+    tables in the chosen format plus summary.json. Returns the summary.
+
+    If a dynamics.LapProfile is given, its per-node arrays (dt, accelerations,
+    binding-limit flags) and sector times are included.
+    """
+    if profile is not None:
+        v_profile, t_cum, kappa = profile.v, profile.t_cum, profile.kappa
+
+    os.makedirs(out_dir, exist_ok=True)
+    write_table(os.path.join(out_dir, f"waypoints.{fmt}"), {"x": x, "y": y}, fmt)
+
+    table = {"x": x_s, "y": y_s}
+    if v_profile is not None:
+        table["v"] = v_profile
+    if t_cum is not None:
+        table["t_cum"] = t_cum
+    if kappa is not None:
+        table["kappa"] = kappa
+    if profile is not None:
+        table.update(dt=profile.dt, a_long=profile.a_long, a_lat=profile.a_lat,
+                     corner_limited=profile.corner_limited,
+                     accel_limited=profile.accel_limited,
+                     brake_limited=profile.brake_limited)
+    write_table(os.path.join(out_dir, f"profile.{fmt}"), table, fmt)
+
+    summary = summarize_track(x, y, x_s, y_s, v_profile, t_cum, kappa)
+    if profile is not None:
+        summary["lap_time_s"] = profile.lap_time
+        summary["sector_times_s"] = profile.sector_times(n_sectors).tolist()
+        summary["time_by_limit_s"] = profile.limit_time_breakdown()
+    with open(os.path.join(out_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    if logger:
+        logger.info(f"Track report written to {out_dir}")
+    return summary
+
+def log_waypoints(x, y, title="ORIGINAL WAYPOINTS", logger=None, quiet=False, max_rows=20):
+    """Log waypoints to terminal as a table (head/tail preview beyond max_rows)."""
+    rows, omitted = _preview_rows(len(x), max_rows)
     lines = []
     lines.append(f"=== {title} ===")
     lines.append(f"Total waypoints: {len(x)}")
     lines.append("Index | X coord | Y coord")
     lines.append("-" * 30)
-    
-    for i, (x_val, y_val) in enumerate(zip(x, y)):
-        lines.append(f"{i:5d} | {x_val:7.2f} | {y_val:7.2f}")
-    
+
+    if not quiet:
+        buf = io.StringIO()
+        np.savetxt(buf, np.column_stack([rows, x[rows], y[rows]]),
+                   fmt="%5d | %7.2f | %7.2f")
+        body = buf.getvalue().splitlines()
+        if omitted:
+            head = len(rows) - max_rows // 2
+            body.insert(head, f"  ... | {omitted} rows omitted")
+        lines.extend(body)
+
     lines.append("=" * 30)
-    
-    # Always print to console
-    for line in lines:
-        print(line)
-    
+    _emit(lines, quiet)
+
     # Also log to file if logger provided
     if logger:
         logger.info(f"Loaded {len(x)} waypoints for track analysis")
 
-def log_spline_info(x_s, y_s, num_preview=5, logger=None):
+def log_spline_info(x_s, y_s, num_preview=5, logger=None, quiet=False):
     """Log spline interpolation information."""
     lines = []
     lines.append(f"=== SPLINE INTERPOLATION ===")
     lines.append(f"Spline points generated: {len(x_s)}")
     lines.append(f"First {num_preview} spline points:")
-    
+
     for i in range(min(num_preview, len(x_s))):
         lines.append(f"  {i}: ({x_s[i]:.2f}, {y_s[i]:.2f})")
-    
+
     lines.append("=" * 30)
-    
-    # Always print to console
-    for line in lines:
-        print(line)
-    
+    _emit(lines, quiet)
+
     # Also log to file if logger provided
     if logger:
         logger.info(f"Generated {len(x_s)} spline points from original waypoints")
 
-def log_dynamics_info(v_profile, t_cum, kappa=None, logger=None):
+def log_dynamics_info(v_profile, t_cum, kappa=None, logger=None, quiet=False):
     """Log dynamics simulation information."""
     lines = []
     lines.append(f"=== DYNAMICS SIMULATION ===")
@@ -50,38 +162,53 @@ def log_dynamics_info(v_profile, t_cum, kappa=None, logger=None):
     lines.append(f"Max speed: {np.max(v_profile)*3.6:.1f} km/h")
     lines.append(f"Min speed: {np.min(v_profile)*3.6:.1f} km/h")
     lines.append(f"Average speed: {np.mean(v_profile)*3.6:.1f} km/h")
-    
+
     if kappa is not None:
         lines.append(f"Max curvature: {np.max(np.abs(kappa)):.4f} rad/m")
         lines.append(f"Sharpest turn radius: {1/(np.max(np.abs(kappa)) + 1e-8):.1f} m")
-    
+
     lines.append("=" * 30)
-    
-    # Always print to console
-    for line in lines:
-        print(line)
-    
+    _emit(lines, quiet)
+
     # Also log to file if logger provided
     if logger:
         logger.info(f"Dynamics simulation completed - Lap time: {t_cum[-1]:.2f}s, Max speed: {np.max(v_profile)*3.6:.1f} km/h")
 
-def log_track_summary(x, y, x_s, y_s, v_profile, t_cum, logger=None):
+def log_sector_times(profile, n_sectors=3, logger=None, quiet=False):
+    """Log sector splits and the time spent under each binding limit."""
+    sectors = profile.sector_times(n_sectors)
+    limits = profile.limit_time_breakdown()
+
+    lines = []
+    lines.append(f"=== SECTOR ANALYSIS ===")
+    for i, t in enumerate(sectors, 1):
+        lines.append(f"Sector {i}: {t:.2f} s")
+    lines.append(f"Corner-limited: {limits['corner']:.2f} s | "
+                 f"Accel-limited: {limits['accel']:.2f} s | "
+                 f"Brake-limited: {limits['brake']:.2f} s | "
+                 f"Free: {limits['free']:.2f} s")
+    lines.append("=" * 30)
+    _emit(lines, quiet)
+
+    # Also log to file if logger provided
+    if logger:
+        logger.info("Sector times: " + ", ".join(f"{t:.2f}s" for t in sectors))
+
+def log_track_summary(x, y, x_s, y_s, v_profile, t_cum, logger=None, quiet=False):
     """Log comprehensive track analysis summary."""
-    track_length = np.sum(np.sqrt(np.diff(x_s)**2 + np.diff(y_s)**2))
-    
+    summary = summarize_track(x, y, x_s, y_s, v_profile, t_cum)
+    track_length = summary["track_length_m"]
+
     lines = []
     lines.append(f"=== TRACK SUMMARY ===")
     lines.append(f"Original waypoints: {len(x)}")
     lines.append(f"Interpolated points: {len(x_s)}")
     lines.append(f"Track length: {track_length:.1f} meters")
     lines.append(f"Estimated lap time: {t_cum[-1]:.2f} seconds")
-    lines.append(f"Average lap speed: {track_length/t_cum[-1]*3.6:.1f} km/h")
+    lines.append(f"Average lap speed: {summary['avg_lap_speed_kmh']:.1f} km/h")
     lines.append("=" * 30)
-    
-    # Always print to console
-    for line in lines:
-        print(line)
-    
+    _emit(lines, quiet)
+
     # Also log to file if logger provided
     if logger:
-        logger.info(f"Track analysis complete - Length: {track_length:.1f}m, Time: {t_cum[-1]:.2f}s, Avg speed: {track_length/t_cum[-1]*3.6:.1f} km/h") 
\ No newline at end of file
+        logger.info(f"Track analysis complete - Length: {track_length:.1f}m, Time: {t_cum[-1]:.2f}s, Avg speed: {summary['avg_lap_speed_kmh']:.1f} km/h")
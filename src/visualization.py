@@ -1,121 +1,309 @@
 # src/visualization.py
 
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 from track_loader import load_waypoints, build_spline
-from dynamics import (
-    compute_curvature, compute_speed_limits,
-    compute_segment_lengths, speed_profile_two_pass
+from dynamics import compute_lap_profile
+from track_reporter import (
+    log_waypoints, log_spline_info, log_dynamics_info, log_track_summary,
+    log_sector_times, write_report
 )
-from track_reporter import log_waypoints, log_spline_info, log_dynamics_info, log_track_summary
 from logger_setup import setup_logger
 
-def prepare_track(num_points=500, logger=None):
+def prepare_track(num_points=500, logger=None, quiet=False,
+                  report_dir=None, report_format="csv"):
     # 1) Load & spline
     x, y = load_waypoints("tracks/waypoints_S.csv")
-    log_waypoints(x, y, logger=logger)
-    
+    log_waypoints(x, y, logger=logger, quiet=quiet)
+
     x_s, y_s = build_spline(x, y, num_points=num_points)
-    log_spline_info(x_s, y_s, logger=logger)
-
-    # 2) Dynamics
-    kappa    = compute_curvature(x_s, y_s)
-    v_limit  = compute_speed_limits(kappa)
-    ds       = compute_segment_lengths(x_s, y_s)
-    v_profile = speed_profile_two_pass(v_limit, ds)
-
-    # 3) Time per segment and cumulative time
-    dt = ds / ( (v_profile + np.roll(v_profile, -1)) / 2 + 1e-8 )
-    t_cum = np.concatenate([[0], np.cumsum(dt)])  # length num_points+1
-    t_cum = t_cum[:-1]  # Remove duplicate last point to match array lengths
-
-    # 4) Approximate longitudinal acceleration a = dv/dt
-    # note: dv between i and i-1 over dt[i-1]
-    dv    = np.diff(v_profile, prepend=v_profile[-1])
-    a_long = dv / np.concatenate([[dt[-1]], dt[:-1]])
-    
+    log_spline_info(x_s, y_s, logger=logger, quiet=quiet)
+
+    # 2) Dynamics, time per segment and acceleration (shared with the optimizer)
+    profile = compute_lap_profile(x_s, y_s)
+    v_profile, a_long, kappa, t_cum = profile.v, profile.a_long, profile.kappa, profile.t_cum
+
     # Log dynamics and track summary
-    log_dynamics_info(v_profile, t_cum, kappa, logger=logger)
-    log_track_summary(x, y, x_s, y_s, v_profile, t_cum, logger=logger)
+    log_dynamics_info(v_profile, t_cum, kappa, logger=logger, quiet=quiet)
+    log_track_summary(x, y, x_s, y_s, v_profile, t_cum, logger=logger, quiet=quiet)
+    log_sector_times(profile, logger=logger, quiet=quiet)
+    if report_dir:
+        write_report(report_dir, x, y, x_s, y_s, fmt=report_format,
+                     logger=logger, profile=profile)
 
     return x_s, y_s, v_profile, a_long, kappa, t_cum
 
-def animate_track(x_s, y_s, v, a, kappa, t_cum, logger=None):
-    if logger:
-        logger.info("Starting lap animation visualization")
-    
-    fig, ax = plt.subplots(figsize=(8,8))
+def _build_scene(ax, x_s, y_s, v):
+    """
+    Draw the static track (centerline + speed-coloured trail as a single
+    LineCollection) and return the dynamic artists: bike marker and HUD texts.
+    """
     ax.plot(x_s, y_s, 'k-', lw=1, alpha=0.5)
-    
-    bike, = ax.plot([], [], 'ro', ms=8)
-    
+
+    # Speed-coloured trail: one collection instead of one Line2D per segment
+    points = np.column_stack([x_s, y_s]).reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    trail = LineCollection(segments, cmap='viridis',
+                           norm=plt.Normalize(v.min(), v.max()),
+                           alpha=0.6, linewidths=3)
+    trail.set_array(v[:-1])
+    ax.add_collection(trail)
+
+    bike, = ax.plot([], [], 'ro', ms=8, animated=True)
+
     # HUD text using ax.text (works better with blitting)
-    speed_text     = ax.text(0.02, 0.98, '', transform=ax.transAxes, fontsize=12, 
-                            color='white', bbox=dict(facecolor='black', alpha=0.8))
-    accel_text     = ax.text(0.02, 0.93, '', transform=ax.transAxes, fontsize=12, 
-                            color='white', bbox=dict(facecolor='black', alpha=0.8))
-    curvature_text = ax.text(0.02, 0.88, '', transform=ax.transAxes, fontsize=12, 
-                            color='white', bbox=dict(facecolor='black', alpha=0.8))
-    lap_time_text  = ax.text(0.70, 0.98, '', transform=ax.transAxes, fontsize=14, 
-                            color='yellow', bbox=dict(facecolor='black', alpha=0.8))
-    
+    hud = dict(transform=ax.transAxes, animated=True)
+    speed_text     = ax.text(0.02, 0.98, '', fontsize=12, color='white',
+                             bbox=dict(facecolor='black', alpha=0.8), **hud)
+    accel_text     = ax.text(0.02, 0.93, '', fontsize=12, color='white',
+                             bbox=dict(facecolor='black', alpha=0.8), **hud)
+    curvature_text = ax.text(0.02, 0.88, '', fontsize=12, color='white',
+                             bbox=dict(facecolor='black', alpha=0.8), **hud)
+    lap_time_text  = ax.text(0.70, 0.98, '', fontsize=14, color='yellow',
+                             bbox=dict(facecolor='black', alpha=0.8), **hud)
+
     ax.set_aspect('equal')
     ax.set_facecolor('#333333')            # dark background
     ax.set_title("Lap Animation with HUD", color='white', fontsize=16)
     ax.tick_params(colors='white')         # white tick labels
-    ax.spines['bottom'].set_color('white')
-    ax.spines['top'].set_color('white')
-    ax.spines['right'].set_color('white')
-    ax.spines['left'].set_color('white')
-
-    # Pre-plot colored trail by speed
-    cmap = plt.get_cmap('viridis')
-    norm = plt.Normalize(v.min(), v.max())
-    for i in range(len(x_s)-1):
-        ax.plot(x_s[i:i+2], y_s[i:i+2],
-                color=cmap(norm(v[i])),
-                alpha=0.6, lw=3)
+    for spine in ax.spines.values():
+        spine.set_color('white')
+
+    return bike, speed_text, accel_text, curvature_text, lap_time_text
+
+def _update_scene(artists, i, x_s, y_s, v, a, kappa, t_cum):
+    """Move the bike to node i and refresh the HUD."""
+    bike, speed_text, accel_text, curvature_text, lap_time_text = artists
+    bike.set_data([x_s[i]], [y_s[i]])
+    speed_text.set_text(f"Speed: {v[i]*3.6:.1f} km/h")
+    accel_text.set_text(f"Accel: {a[i]:+.2f} m/s²")
+    curvature_text.set_text(f"Curv: {kappa[i]:.3f} 1/m")
+    lap_time_text.set_text(f"Lap time: {t_cum[i]:.2f} s")
+    return artists
+
+def animate_track(x_s, y_s, v, a, kappa, t_cum, logger=None):
+    if logger:
+        logger.info("Starting lap animation visualization")
+
+    fig, ax = plt.subplots(figsize=(8,8))
+    artists = _build_scene(ax, x_s, y_s, v)
 
     def init():
-        bike.set_data([], [])
-        speed_text.set_text('')
-        accel_text.set_text('')
-        curvature_text.set_text('')
-        lap_time_text.set_text('')
-        return bike, speed_text, accel_text, curvature_text, lap_time_text
+        for text in artists[1:]:
+            text.set_text('')
+        artists[0].set_data([], [])
+        return artists
 
     def update(frame):
         # frame is an index into the spline arrays
-        i = frame % len(x_s)
-        bike.set_data([x_s[i]], [y_s[i]])
-        speed_text.set_text(f"Speed: {v[i]*3.6:.1f} km/h")
-        accel_text.set_text(f"Accel: {a[i]:+.2f} m/s²")
-        curvature_text.set_text(f"Curv: {kappa[i]:.3f} 1/m")
-        lap_time_text.set_text(f"Lap time: {t_cum[i]:.2f} s")
-        return bike, speed_text, accel_text, curvature_text, lap_time_text
+        return _update_scene(artists, frame % len(x_s), x_s, y_s, v, a, kappa, t_cum)
 
     # animation speed: map real lap to ~15s of playback
-    total_time   = t_cum[-1]
     playback_sec = 15_000  # milliseconds
     interval     = playback_sec / len(x_s)
 
     ani = FuncAnimation(fig, update, frames=len(x_s),
-                        init_func=init, blit=False, interval=interval)
+                        init_func=init, blit=True, interval=interval)
     plt.show()
 
+class _PngSequenceSink:
+    """Write frames as frame_00000.png, ... into a directory."""
+
+    def __init__(self, path, size, fps):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.count = 0
+
+    def write(self, rgba):
+        plt.imsave(os.path.join(self.path, f"frame_{self.count:05d}.png"), rgba)
+        self.count += 1
+
+    def close(self):
+        pass
+
+class _GifSink:
+    """Collect palette-quantized frames and save them as an animated GIF."""
+
+    def __init__(self, path, size, fps):
+        self.path = path
+        self.duration = 1000 / fps
+        self.frames = []
+
+    def write(self, rgba):
+        from PIL import Image
+        self.frames.append(Image.fromarray(rgba[..., :3]).quantize(
+            colors=256, method=Image.Quantize.FASTOCTREE))
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.path, save_all=True, append_images=self.frames[1:],
+                                duration=self.duration, loop=0)
+
+class _FfmpegSink:
+    """Pipe raw RGBA frames into ffmpeg to encode an MP4."""
+
+    def __init__(self, path, size, fps):
+        ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path']) or shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found; export to .gif or a PNG directory instead")
+        width, height = size
+        self.proc = subprocess.Popen(
+            [ffmpeg, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}',
+             '-r', str(fps), '-i', '-',
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+             '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE)
+
+    def write(self, rgba):
+        self.proc.stdin.write(rgba.tobytes())
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.proc.returncode}")
+
+def _frame_sink(path, size, fps):
+    """Pick the output writer from the path: .mp4, .gif, or a PNG directory."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.mp4', '.gif') and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    if ext == '.mp4':
+        return _FfmpegSink(path, size, fps)
+    if ext == '.gif':
+        return _GifSink(path, size, fps)
+    return _PngSequenceSink(path, size, fps)
+
+def export_animation(x_s, y_s, v, a, kappa, t_cum, path,
+                     fps=30, frame_step=1, dpi=100, figsize=(8, 8), logger=None):
+    """
+    Render the lap animation headlessly (Agg canvas, no GUI needed).
+
+    The static track is drawn once; each frame only restores the cached
+    background and redraws the bike and HUD (manual blitting).
+
+    Args:
+        path: '.mp4' (needs ffmpeg), '.gif', or a directory for a PNG sequence
+        frame_step: render every n-th spline node
+    Returns:
+        Number of frames written
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    artists = _build_scene(ax, x_s, y_s, v)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+    sink = _frame_sink(path, (width, height), fps)
+
+    frames = range(0, len(x_s), frame_step)
+    try:
+        for i in frames:
+            canvas.restore_region(background)
+            for artist in _update_scene(artists, i, x_s, y_s, v, a, kappa, t_cum):
+                ax.draw_artist(artist)
+            sink.write(np.asarray(canvas.buffer_rgba()))
+    finally:
+        sink.close()
+
+    if logger:
+        logger.info(f"Exported {len(frames)} frames to {path}")
+    return len(frames)
+
+def _export_line(job):
+    """Batch worker: compute the profile of one line and export it."""
+    name, x_line, y_line, out_dir, ext, track, kwargs = job
+    p = compute_lap_profile(x_line, y_line, **track)
+    path = os.path.join(out_dir, name + ext)
+    export_animation(x_line, y_line, p.v, p.a_long, p.kappa, p.t_cum, path, **kwargs)
+    return path
+
+def render_lines_batch(lines, out_dir, fmt='gif', workers=1, closed=True,
+                       v_entry=None, v_exit=None, **kwargs):
+    """
+    Export an animation for each (name, x, y) racing line.
+
+    Args:
+        lines: iterable of (name, x, y) tuples
+        fmt: 'mp4', 'gif' or 'png' (one PNG-sequence directory per line)
+        workers: rendering processes (0 = one per CPU core)
+        closed, v_entry, v_exit: track topology and open-track entry/exit
+                                 speeds (m/s) used to simulate each line
+        **kwargs: forwarded to export_animation (fps, frame_step, dpi, ...)
+    Returns:
+        List of written paths
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ext = '' if fmt == 'png' else '.' + fmt
+    track = dict(closed=closed, v_entry=v_entry, v_exit=v_exit)
+    jobs = [(name, np.asarray(x), np.asarray(y), out_dir, ext, track, kwargs)
+            for name, x, y in lines]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_export_line(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_export_line, jobs))
+
+def render_hall_of_fame(x_s, y_s, results, out_dir, fmt='gif', workers=1,
+                        closed=True, interpolation='linear', v_entry=None,
+                        v_exit=None, **kwargs):
+    """
+    Batch-export the racing lines of a hall of fame (list of LapResult).
+    closed/interpolation/v_entry/v_exit must match the GA run that produced
+    the genes.
+    """
+    from step3_evaluation import offset_trajectory
+    lines = []
+    for result in results:
+        x_line, y_line = offset_trajectory(result.individual, x_s, y_s,
+                                           closed, interpolation)
+        lines.append((f"rank{result.rank:02d}_{result.lap_time:.3f}s", x_line, y_line))
+    return render_lines_batch(lines, out_dir, fmt=fmt, workers=workers, closed=closed,
+                              v_entry=v_entry, v_exit=v_exit, **kwargs)
+
 if __name__ == "__main__":
-    # Setup logger for file output  
-    import os
+    import argparse
+    parser = argparse.ArgumentParser(description="Animate (or export) the simulated lap")
+    parser.add_argument("--export", "-e", default=None,
+                        help="Render headlessly to .mp4, .gif or a PNG directory")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--frame-step", type=int, default=1,
+                        help="Render every n-th spline node")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Do not print track reports to the console")
+    parser.add_argument("--report-dir", default=None,
+                        help="Write full track report tables to this directory")
+    parser.add_argument("--report-format", choices=["csv", "json", "md"], default="csv")
+    args = parser.parse_args()
+
+    # Setup logger for file output
     os.makedirs("outputs/logs", exist_ok=True)
     main_logger = setup_logger()
     main_logger.info("Starting visualization")
-    
+
     # Prepare track data with logging
-    x_s, y_s, v_profile, a_long, kappa, t_cum = prepare_track(num_points=500, logger=main_logger)
-    
-    # Start animation
-    animate_track(x_s, y_s, v_profile, a_long, kappa, t_cum, logger=main_logger)
-    
+    x_s, y_s, v_profile, a_long, kappa, t_cum = prepare_track(
+        num_points=500, logger=main_logger, quiet=args.quiet,
+        report_dir=args.report_dir, report_format=args.report_format)
+
+    if args.export:
+        export_animation(x_s, y_s, v_profile, a_long, kappa, t_cum, args.export,
+                         fps=args.fps, frame_step=args.frame_step, logger=main_logger)
+    else:
+        # Start animation
+        animate_track(x_s, y_s, v_profile, a_long, kappa, t_cum, logger=main_logger)
+
     main_logger.info("Visualization completed")